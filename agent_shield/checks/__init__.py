@@ -10,3 +10,15 @@ Available checks:
 - art14_human_oversight  — EU AI Act Art. 14: automated decisions without human review
 - art22_accountability   — EU AI Act Art. 22 + GDPR Art. 5(2): accountability ownership
 """
+
+# Importing a check module registers its check; checks run in this order
+from agent_shield.checks import (  # noqa: F401
+    secrets,
+    audit_logging,
+    human_oversight,
+    data_classification,
+    error_handling,
+    documentation,
+    art14_human_oversight,
+    art22_accountability,
+)
@@ -0,0 +1,58 @@
+"""Pattern and file-selection helpers shared by the check modules.
+
+Presence-only pattern groups are fused into one alternation per group and
+guarded by literal anchors ("prefilters"): every pattern in a group
+contains at least one of its anchors, so a file containing none of them
+cannot match and the regex search is skipped. Groups written in lowercase
+are compiled without ``re.IGNORECASE`` and searched in the lowercased
+content, which lets the regex engine use its literal fast paths; their
+anchors are lowercase too.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+from pathlib import Path
+
+from agent_shield.filecache import FileCache
+
+# (signal name, fused regex, literal anchors)
+SignalGroup = tuple[str, re.Pattern, tuple[str, ...]]
+
+
+def fuse(patterns: Iterable[str], flags: int = 0) -> re.Pattern:
+    """Compile *patterns* into one alternation, each wrapped in a non-capturing group."""
+    return re.compile("|".join(f"(?:{p})" for p in patterns), flags)
+
+
+def gated_search(text: str, regex: re.Pattern, prefilters: tuple[str, ...]) -> bool:
+    """Return whether *regex* matches *text*, searching only if one of *prefilters* occurs in it."""
+    return any(s in text for s in prefilters) and regex.search(text) is not None
+
+
+def search_groups(text: str, wanted: frozenset[str], groups: Iterable[SignalGroup]) -> dict[str, bool]:
+    """Return ``{name: matched}`` for *groups*; names not in *wanted* are False without searching."""
+    return {
+        name: name in wanted and gated_search(text, regex, prefilters)
+        for name, regex, prefilters in groups
+    }
+
+
+def unseen(**seen: bool) -> tuple[frozenset[str]]:
+    """Return the ``FileCache.map`` arguments requesting the signals not yet *seen*."""
+    return (frozenset(name for name, found in seen.items() if not found),)
+
+
+def is_test_file(cache: FileCache, path: Path, project_path: Path) -> bool:
+    """Return whether *path* is a test, mock or fixture file.
+
+    Checks that flag agent patterns skip these: they exercise the patterns
+    on purpose and would only produce false positives.
+    """
+    name = path.name
+    return (
+        name.startswith("test_") or name.endswith("_test.py")
+        or name.endswith("_mock.py") or name == "conftest.py"
+        or "fixtures" in cache.relative(path, project_path).parts
+    )
@@ -0,0 +1,55 @@
+"""One pass over each file for every check that scans file content.
+
+When a scan runs on the worker pool, shipping every file to the workers
+once per check is the dominant cost. :func:`prescan` instead sends each
+file once and runs all applicable per-file scans on it, with every signal
+requested. The results are handed to the cache, so each ``check_*``
+aggregates over them through :meth:`FileCache.map` as usual.
+
+In-process scans skip this: there the per-check passes stop searching for
+signals already found, which beats one pass that looks for everything.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from agent_shield.filecache import FileCache
+from agent_shield.registry import registered_file_scans
+
+
+def _scan_all(content: str, scans: tuple[tuple[Callable, tuple], ...]) -> tuple[Any, ...]:
+    """Return ``scan(content, *args)`` for each ``(scan, args)`` pair in *scans*."""
+    return tuple(scan(content, *args) for scan, args in scans)
+
+
+def prescan(cache: FileCache, project_path: Path, files: list[Path], check_names: list[str]) -> None:
+    """Scan *files* once for all of *check_names* and preload the results into *cache*.
+
+    The per-file scans come from each check's registered
+    :class:`~agent_shield.registry.FileScan`. Each file is scanned only for
+    the checks that select it, so a config file costs the secrets scan alone
+    and a test file skips the Art. 14 and Art. 22 scans. Files read by the
+    same checks form one batch, with those checks' scans passed to the
+    workers as the batch's argument.
+    """
+    file_scans = registered_file_scans()
+    scans = [file_scans[name] for name in check_names if name in file_scans]
+    if len(scans) < 2:
+        return
+    # file -> the scans that read it, in check order
+    readers: dict[Path, list[tuple[Callable, tuple]]] = {}
+    for file_scan in scans:
+        for f in file_scan.select(cache, files, project_path):
+            readers.setdefault(f, []).append((file_scan.scan, file_scan.args))
+    if not cache.parallel(len(readers)):
+        return
+    batches: dict[tuple[tuple[Callable, tuple], ...], list[Path]] = {}
+    for f, file_scans_of_f in readers.items():
+        batches.setdefault(tuple(file_scans_of_f), []).append(f)
+    for batch_scans, batch in batches.items():
+        for f, results in cache.map(_scan_all, batch, lambda: (batch_scans,)):
+            for (scan, _), result in zip(batch_scans, results):
+                cache.preload(scan, f, result)
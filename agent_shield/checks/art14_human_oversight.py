@@ -2,104 +2,123 @@
 import re
 from pathlib import Path
 
-# LLM/agent output used directly in conditionals
-LLM_CONDITIONAL_PATTERNS = [
-    (r'if\s+(?:llm|gpt|claude|agent|model|ai)[_\.]?(?:response|output|result|answer|decision)\s*[=!<>]', "LLM output in conditional"),
-    (r'if\s+(?:response|result|output)\s*==\s*["\'](?:approve|yes|true|allow|accept)', "LLM string match driving decision"),
-    (r'if\s+(?:agent|bot|assistant)\.(?:decide|judge|evaluate|classify|determine)\s*\(', "Agent decision method in conditional"),
-    (r'(?:response|result|output|decision)\s*=\s*(?:llm|gpt|claude|agent|model)\..+\n\s*if\s+(?:response|result|output|decision)', "LLM call immediately followed by conditional"),
-]
-
-# Auto-* function patterns (risk: automation without human checkpoint)
-AUTO_FUNCTION_PATTERNS = [
-    r'(?i)def\s+auto[_\-]?approve',
-    r'(?i)def\s+auto[_\-]?decide',
-    r'(?i)def\s+auto[_\-]?execute',
-    r'(?i)def\s+auto[_\-]?process',
-    r'(?i)def\s+auto[_\-]?classify',
-    r'(?i)def\s+auto[_\-]?route',
-    r'(?i)def\s+auto[_\-]?assign',
-]
-
-# Human review companion patterns (presence = mitigating factor)
-HUMAN_REVIEW_PATTERNS = [
-    r'(?i)human[_\-]?review',
-    r'(?i)human[_\-]?approval',
-    r'(?i)human[_\-]?oversight',
-    r'(?i)human[_\-]?intervention',
-    r'(?i)manual[_\-]?review',
-    r'(?i)require[_\-]?approval',
-    r'(?i)pending[_\-]?review',
-    r'(?i)approval[_\-]?gate',
-]
+from agent_shield.checks._patterns import fuse, gated_search, is_test_file
+from agent_shield.filecache import FileCache
+from agent_shield.registry import FileScan, register_check
 
-# Agent output piped directly to system actions
-DIRECT_ACTION_PATTERNS = [
-    (r'(?:llm|agent|model|gpt|claude|ai)[_\.]?(?:response|output|result).{0,80}(?:\.execute|\.run|\.send|\.write|\.delete|\.update|\.insert|\.post|\.put|\.patch)', "Agent output piped to system action"),
-    (r'(?:cursor|db|conn|session|collection)\.(?:execute|insert|update|delete|write)\(.{0,40}(?:response|output|result|answer)', "Agent output in database operation"),
-    (r'(?:requests|httpx|aiohttp|fetch|axios)\.\w+\(.{0,60}(?:response|output|result)', "Agent output in HTTP request"),
-    (r'(?:send_email|send_message|send_notification|publish)\(.{0,60}(?:response|output|result)', "Agent output in outbound communication"),
-    (r'(?:open|write_text|write_bytes)\(.{0,60}(?:response|output|result)', "Agent output written to file"),
-    (r'(?:subprocess|os\.system|exec|eval)\(.{0,60}(?:response|output|result)', "Agent output in code execution"),
-]
+CODE_EXTENSIONS = frozenset({".py", ".js", ".ts", ".jsx", ".tsx"})
 
+# LLM/agent output used directly in conditionals
+LLM_CONDITIONAL_PATTERNS = (
+    (re.compile(r'if\s+(?:llm|gpt|claude|agent|model|ai)[_\.]?(?:response|output|result|answer|decision)\s*[=!<>]'), "LLM output in conditional"),
+    (re.compile(r'if\s+(?:response|result|output)\s*==\s*["\'](?:approve|yes|true|allow|accept)'), "LLM string match driving decision"),
+    (re.compile(r'if\s+(?:agent|bot|assistant)\.(?:decide|judge|evaluate|classify|determine)\s*\('), "Agent decision method in conditional"),
+    (re.compile(r'(?:response|result|output|decision)\s*=\s*(?:llm|gpt|claude|agent|model)\..+\n\s*if\s+(?:response|result|output|decision)'), "LLM call immediately followed by conditional"),
+)
+
+# Auto-* function patterns (risk: automation without human checkpoint).
+# Group 1 captures the function name prefix for the report.
+AUTO_FUNCTION_VERBS = ("approve", "decide", "execute", "process", "classify", "route", "assign")
+AUTO_FUNCTION_RE = re.compile(
+    r'def\s+(auto[_\-]?(?:' + "|".join(AUTO_FUNCTION_VERBS) + '))', re.IGNORECASE
+)
+
+# Human review companion patterns (presence = mitigating factor).
+# Presence-only, lowercase, searched in the lowercased content.
+HUMAN_REVIEW_PATTERNS = (
+    r'human[_\-]?review',
+    r'human[_\-]?approval',
+    r'human[_\-]?oversight',
+    r'human[_\-]?intervention',
+    r'manual[_\-]?review',
+    r'require[_\-]?approval',
+    r'pending[_\-]?review',
+    r'approval[_\-]?gate',
+)
+HUMAN_REVIEW_RE = fuse(HUMAN_REVIEW_PATTERNS)
 
-def check_art14_human_oversight(project_path: Path, files: list[Path]) -> dict:
+# Agent output piped directly to system actions
+DIRECT_ACTION_PATTERNS = (
+    (re.compile(r'(?:llm|agent|model|gpt|claude|ai)[_\.]?(?:response|output|result).{0,80}(?:\.execute|\.run|\.send|\.write|\.delete|\.update|\.insert|\.post|\.put|\.patch)', re.DOTALL), "Agent output piped to system action"),
+    (re.compile(r'(?:cursor|db|conn|session|collection)\.(?:execute|insert|update|delete|write)\(.{0,40}(?:response|output|result|answer)', re.DOTALL), "Agent output in database operation"),
+    (re.compile(r'(?:requests|httpx|aiohttp|fetch|axios)\.\w+\(.{0,60}(?:response|output|result)', re.DOTALL), "Agent output in HTTP request"),
+    (re.compile(r'(?:send_email|send_message|send_notification|publish)\(.{0,60}(?:response|output|result)', re.DOTALL), "Agent output in outbound communication"),
+    (re.compile(r'(?:open|write_text|write_bytes)\(.{0,60}(?:response|output|result)', re.DOTALL), "Agent output written to file"),
+    (re.compile(r'(?:subprocess|os\.system|exec|eval)\(.{0,60}(?:response|output|result)', re.DOTALL), "Agent output in code execution"),
+)
+
+# Literal anchors per group; case-insensitive groups use lowercase anchors
+HUMAN_REVIEW_PREFILTERS = ("human", "manual", "approval", "pending")
+AUTO_FUNCTION_PREFILTERS = ("auto",)
+LLM_CONDITIONAL_PREFILTERS = ("if",)
+DIRECT_ACTION_PREFILTERS = ("response", "output", "result", "answer")
+
+
+def _scan_file(content: str, want_human_review: bool) -> dict:
+    """Collect Art. 14 signals from one file. Hits are (offset, label) pairs."""
+    lc = content.lower()
+    found: dict = {"human_review": False, "llm_conditional": [], "auto_func": [], "direct_action": []}
+
+    if want_human_review:
+        found["human_review"] = gated_search(lc, HUMAN_REVIEW_RE, HUMAN_REVIEW_PREFILTERS)
+    if any(s in content for s in LLM_CONDITIONAL_PREFILTERS):
+        found["llm_conditional"] = [
+            (match.start(), desc)
+            for pattern, desc in LLM_CONDITIONAL_PATTERNS
+            for match in pattern.finditer(content)
+        ]
+    if any(s in lc for s in AUTO_FUNCTION_PREFILTERS):
+        found["auto_func"] = [
+            (match.start(), match.group(1))
+            for match in AUTO_FUNCTION_RE.finditer(content)
+        ]
+    if any(s in content for s in DIRECT_ACTION_PREFILTERS):
+        found["direct_action"] = [
+            (match.start(), desc)
+            for pattern, desc in DIRECT_ACTION_PATTERNS
+            for match in pattern.finditer(content)
+        ]
+    return found
+
+
+def _select_files(cache: FileCache, files: list[Path], project_path: Path) -> list[Path]:
+    """Return the code files this check scans with :func:`_scan_file`."""
+    return [
+        f for f in cache.select(files, CODE_EXTENSIONS)
+        if not is_test_file(cache, f, project_path)
+    ]
+
+
+@register_check("check_art14_human_oversight", FileScan(_select_files, _scan_file, (True,)))
+def check_art14_human_oversight(project_path: Path, files: list[Path], cache: FileCache | None = None) -> dict:
     """Check for automated decision paths without human review. Max 15 points."""
+    if cache is None:
+        cache = FileCache()
     score = 15
     findings = []
-    code_extensions = {".py", ".js", ".ts", ".jsx", ".tsx"}
 
     llm_conditional_hits = []
     auto_func_hits = []
     direct_action_hits = []
     has_human_review = False
 
-    for f in files:
-        if f.suffix not in code_extensions:
-            continue
-        # Skip test/mock/fixture files — false positives on agent patterns
-        if (f.name.startswith("test_") or f.name.endswith("_test.py")
-                or f.name.endswith("_mock.py") or f.name == "conftest.py"
-                or "fixtures" in f.relative_to(project_path).parts):
-            continue
-        try:
-            content = f.read_text(errors="ignore")
-        except Exception:
-            continue
-
-        rel_path = str(f.relative_to(project_path))
-
+    code_files = _select_files(cache, files, project_path)
+    for f, found in cache.map(_scan_file, code_files, lambda: (not has_human_review,)):
         # Check for human review patterns (mitigating factor)
-        for pattern in HUMAN_REVIEW_PATTERNS:
-            if re.search(pattern, content):
-                has_human_review = True
-                break
-
-        # Check LLM output in conditionals
-        for pattern, desc in LLM_CONDITIONAL_PATTERNS:
-            for match in re.finditer(pattern, content):
-                line_num = content[:match.start()].count("\n") + 1
-                llm_conditional_hits.append((rel_path, line_num, desc))
-
-        # Check auto-* functions
-        for pattern in AUTO_FUNCTION_PATTERNS:
-            for match in re.finditer(pattern, content):
-                line_num = content[:match.start()].count("\n") + 1
-                func_name = match.group().split("def ")[-1].strip()
-                auto_func_hits.append((rel_path, line_num, func_name))
-
-        # Check direct action patterns
-        for pattern, desc in DIRECT_ACTION_PATTERNS:
-            for match in re.finditer(pattern, content, re.DOTALL):
-                line_num = content[:match.start()].count("\n") + 1
-                direct_action_hits.append((rel_path, line_num, desc))
+        if found["human_review"]:
+            has_human_review = True
+
+        # Hits keep (file, offset, label); only the few that are reported
+        # get resolved to a line number
+        llm_conditional_hits.extend((f, offset, desc) for offset, desc in found["llm_conditional"])
+        auto_func_hits.extend((f, offset, name) for offset, name in found["auto_func"])
+        direct_action_hits.extend((f, offset, desc) for offset, desc in found["direct_action"])
 
     # --- Score and report ---
 
     if llm_conditional_hits:
         score -= 5
-        locations = [f"{h[0]}:{h[1]}" for h in llm_conditional_hits[:5]]
+        locations = [cache.location(h[0], h[1], project_path) for h in llm_conditional_hits[:5]]
         findings.append({
             "severity": "critical",
             "category": "art14_human_oversight",
@@ -115,7 +134,7 @@ def check_art14_human_oversight(project_path: Path, files: list[Path]) -> dict:
 
     if auto_func_hits and not has_human_review:
         score -= 4
-        locations = [f"{h[0]}:{h[1]} ({h[2]})" for h in auto_func_hits[:5]]
+        locations = [f"{cache.location(h[0], h[1], project_path)} ({h[2]})" for h in auto_func_hits[:5]]
         findings.append({
             "severity": "critical",
             "category": "art14_human_oversight",
@@ -138,7 +157,7 @@ def check_art14_human_oversight(project_path: Path, files: list[Path]) -> dict:
 
     if direct_action_hits:
         score -= 5
-        locations = [f"{h[0]}:{h[1]}" for h in direct_action_hits[:5]]
+        locations = [cache.location(h[0], h[1], project_path) for h in direct_action_hits[:5]]
         descs = list({h[2] for h in direct_action_hits})
         findings.append({
             "severity": "critical",
@@ -1,62 +1,133 @@
 """Check for missing accountability ownership (EU AI Act Article 22 + GDPR Article 5(2))."""
 import re
+from operator import itemgetter
 from pathlib import Path
 
+from agent_shield.checks._patterns import fuse, gated_search, is_test_file, unseen
+from agent_shield.filecache import FileCache
+from agent_shield.registry import FileScan, register_check
+
+CODE_EXTENSIONS = frozenset({".py", ".js", ".ts", ".jsx", ".tsx"})
+
 # Agent/tool config files that should declare an owner
-CONFIG_EXTENSIONS = {".yaml", ".yml", ".toml", ".json"}
-OWNER_PATTERNS = [
-    r'(?i)["\']?(?:owner|responsible[_\-]?party|contact|maintainer|accountable)["\']?\s*[:=]',
-]
+CONFIG_EXTENSIONS = frozenset({".yaml", ".yml", ".toml", ".json"})
+OWNER_PATTERNS = (
+    r'["\']?(?:owner|responsible[_\-]?party|contact|maintainer|accountable)["\']?\s*[:=]',
+)
+OWNER_RE = fuse(OWNER_PATTERNS, re.IGNORECASE)
+
+# The presence-only groups below (multi-agent, escalation, validation, audit
+# trail) are lowercase and searched in the lowercased content.
 
 # Multi-agent orchestration patterns
-MULTI_AGENT_PATTERNS = [
-    r'(?i)(?:agent|tool)[_\-]?chain',
-    r'(?i)(?:multi[_\-]?agent|agent[_\-]?orchestrat|agent[_\-]?pipeline)',
-    r'(?i)(?:run[_\-]?agent|call[_\-]?agent|invoke[_\-]?agent|spawn[_\-]?agent)',
-    r'(?i)(?:crew|swarm|graph)\s*[\(\{=]',
-    r'(?i)agent\s*\(\s*["\']',
-    r'(?i)tools?\s*=\s*\[.*(?:agent|tool)',
-]
-
-ESCALATION_PATTERNS = [
-    r'(?i)escalat(?:e|ion)',
-    r'(?i)fallback[_\-]?handler',
-    r'(?i)on[_\-]?(?:error|failure)[_\-]?(?:escalate|notify|alert)',
-    r'(?i)human[_\-]?fallback',
-]
-
-# Silent error handling on agent paths
-SILENT_ERROR_PATTERNS = [
-    (r'except\s*:\s*\n\s*pass', "Bare except with pass"),
-    (r'except\s+\w+.*:\s*\n\s*pass', "Typed except with pass"),
-    (r'except.*:\s*\n\s*logger?\.debug\(', "Exception logged at debug level only"),
-    (r'except.*:\s*\n\s*#\s*(?:todo|ignore|skip)', "Exception silenced with comment"),
-]
+MULTI_AGENT_PATTERNS = (
+    r'(?:agent|tool)[_\-]?chain',
+    r'(?:multi[_\-]?agent|agent[_\-]?orchestrat|agent[_\-]?pipeline)',
+    r'(?:run[_\-]?agent|call[_\-]?agent|invoke[_\-]?agent|spawn[_\-]?agent)',
+    r'(?:crew|swarm|graph)\s*[\(\{=]',
+    r'agent\s*\(\s*["\']',
+    r'tools?\s*=\s*\[.*(?:agent|tool)',
+)
+MULTI_AGENT_RE = fuse(MULTI_AGENT_PATTERNS)
+
+ESCALATION_PATTERNS = (
+    r'escalat(?:e|ion)',
+    r'fallback[_\-]?handler',
+    r'on[_\-]?(?:error|failure)[_\-]?(?:escalate|notify|alert)',
+    r'human[_\-]?fallback',
+)
+ESCALATION_RE = fuse(ESCALATION_PATTERNS)
+
+# Silent error handling on agent paths. Each pattern is what follows the
+# `except` keyword; they are fused behind that literal into a single regex
+# and the matching one is recovered from the named group that fired.
+SILENT_ERROR_PATTERNS = (
+    (r'\s*:\s*\n\s*pass', "Bare except with pass"),
+    (r'\s+\w+.*:\s*\n\s*pass', "Typed except with pass"),
+    (r'.*:\s*\n\s*logger?\.debug\(', "Exception logged at debug level only"),
+    (r'.*:\s*\n\s*#\s*(?:todo|ignore|skip)', "Exception silenced with comment"),
+)
+SILENT_ERROR_RE = re.compile(
+    r'except(?:' + "|".join(f"(?P<p{i}>{p})" for i, (p, _) in enumerate(SILENT_ERROR_PATTERNS)) + ')'
+)
 
 # Output validation patterns (presence = good)
-VALIDATION_PATTERNS = [
-    r'(?i)(?:schema|pydantic|validate|validator|jsonschema)',
-    r'(?i)(?:type[_\-]?check|isinstance|assert\s+isinstance)',
-    r'(?i)(?:bounds[_\-]?check|range[_\-]?check|clamp|min\(.*max\()',
-    r'(?i)(?:sanitize|escape|clean|strip[_\-]?tags)',
-    r'(?i)(?:output[_\-]?valid|response[_\-]?valid|result[_\-]?valid)',
-]
+VALIDATION_PATTERNS = (
+    r'(?:schema|pydantic|validate|validator|jsonschema)',
+    r'(?:type[_\-]?check|isinstance|assert\s+isinstance)',
+    r'(?:bounds[_\-]?check|range[_\-]?check|clamp|min\(.*max\()',
+    r'(?:sanitize|escape|clean|strip[_\-]?tags)',
+    r'(?:output[_\-]?valid|response[_\-]?valid|result[_\-]?valid)',
+)
+VALIDATION_RE = fuse(VALIDATION_PATTERNS)
 
 # Audit trail patterns (presence = good)
-AUDIT_TRAIL_PATTERNS = [
-    r'(?i)(?:timestamp|created[_\-]?at|logged[_\-]?at)',
-    r'(?i)(?:agent[_\-]?id|actor[_\-]?id|user[_\-]?id)',
-    r'(?i)(?:input[_\-]?hash|output[_\-]?hash|content[_\-]?hash)',
-    r'(?i)(?:decision[_\-]?rationale|reasoning|justification|explanation)',
-    r'(?i)(?:audit[_\-]?log|audit[_\-]?trail|audit[_\-]?record|audit[_\-]?entry)',
-]
+AUDIT_TRAIL_PATTERNS = (
+    r'(?:timestamp|created[_\-]?at|logged[_\-]?at)',
+    r'(?:agent[_\-]?id|actor[_\-]?id|user[_\-]?id)',
+    r'(?:input[_\-]?hash|output[_\-]?hash|content[_\-]?hash)',
+    r'(?:decision[_\-]?rationale|reasoning|justification|explanation)',
+    r'(?:audit[_\-]?log|audit[_\-]?trail|audit[_\-]?record|audit[_\-]?entry)',
+)
+AUDIT_TRAIL_RE = fuse(AUDIT_TRAIL_PATTERNS)
+
+# Literal anchors per group; case-insensitive groups use lowercase anchors
+MULTI_AGENT_PREFILTERS = ("agent", "tool", "crew", "swarm", "graph")
+ESCALATION_PREFILTERS = ("escalat", "fallback", "notify", "alert")
+SILENT_ERROR_PREFILTERS = ("except",)
+AUDIT_TRAIL_PREFILTERS = (
+    "timestamp", "created", "logged", "agent", "actor", "user", "hash",
+    "rationale", "reasoning", "justification", "explanation", "audit",
+)
+
+
+def _scan_file(content: str, wanted: frozenset[str]) -> dict:
+    """Collect Art. 22 signals from one code file. Hits are (offset, label) pairs.
+
+    Presence flags not in *wanted* are reported as False without searching.
+    """
+    lc = content.lower()
+    found: dict = {
+        "multi_agent": False,
+        "escalation": False,
+        "silent_error": [],
+        "output_validation": False,
+        "audit_trail": False,
+    }
 
+    if "multi_agent" in wanted:
+        found["multi_agent"] = gated_search(lc, MULTI_AGENT_RE, MULTI_AGENT_PREFILTERS)
+    if "escalation" in wanted:
+        found["escalation"] = gated_search(lc, ESCALATION_RE, ESCALATION_PREFILTERS)
+    if any(s in content for s in SILENT_ERROR_PREFILTERS):
+        hits = [(match.start(), int(match.lastgroup[1:])) for match in SILENT_ERROR_RE.finditer(content)]
+        hits.sort(key=itemgetter(1))  # report grouped by pattern, as listed above
+        found["silent_error"] = [(offset, SILENT_ERROR_PATTERNS[i][1]) for offset, i in hits]
+    if "output_validation" in wanted:
+        found["output_validation"] = VALIDATION_RE.search(lc) is not None
+    # Audit trail fields are counted per-file, not per-pattern
+    found["audit_trail"] = gated_search(lc, AUDIT_TRAIL_RE, AUDIT_TRAIL_PREFILTERS)
+    return found
 
-def check_art22_accountability(project_path: Path, files: list[Path]) -> dict:
+
+def _select_files(cache: FileCache, files: list[Path], project_path: Path) -> list[Path]:
+    """Return the code files this check scans with :func:`_scan_file`."""
+    return [
+        f for f in cache.select(files, CODE_EXTENSIONS)
+        if not is_test_file(cache, f, project_path)
+    ]
+
+
+@register_check(
+    "check_art22_accountability",
+    FileScan(_select_files, _scan_file, (frozenset({"multi_agent", "escalation", "output_validation"}),)),
+)
+def check_art22_accountability(project_path: Path, files: list[Path], cache: FileCache | None = None) -> dict:
     """Check for missing accountability ownership. Max 15 points."""
+    if cache is None:
+        cache = FileCache()
     score = 15
     findings = []
-    code_extensions = {".py", ".js", ".ts", ".jsx", ".tsx"}
 
     has_owner_field = False
     has_multi_agent = False
@@ -66,66 +137,35 @@ def check_art22_accountability(project_path: Path, files: list[Path]) -> dict:
     audit_trail_count = 0
 
     # --- Scan config files for owner/responsible_party ---
-    for f in files:
-        if f.suffix not in CONFIG_EXTENSIONS:
+    for f in cache.select(files, CONFIG_EXTENSIONS):
+        if is_test_file(cache, f, project_path):
             continue
-        if (f.name.startswith("test_") or f.name.endswith("_test.py")
-                or f.name.endswith("_mock.py") or f.name == "conftest.py"
-                or "fixtures" in f.relative_to(project_path).parts):
+        content = cache.read_text(f)
+        if content is None:
             continue
-        try:
-            content = f.read_text(errors="ignore")
-        except Exception:
-            continue
-        for pattern in OWNER_PATTERNS:
-            if re.search(pattern, content):
-                has_owner_field = True
-                break
+        if OWNER_RE.search(content):
+            has_owner_field = True
+            break
 
     # --- Scan code files ---
-    for f in files:
-        if f.suffix not in code_extensions:
-            continue
-        if (f.name.startswith("test_") or f.name.endswith("_test.py")
-                or f.name.endswith("_mock.py") or f.name == "conftest.py"
-                or "fixtures" in f.relative_to(project_path).parts):
-            continue
-        try:
-            content = f.read_text(errors="ignore")
-        except Exception:
-            continue
+    code_files = _select_files(cache, files, project_path)
+
+    def wanted() -> tuple[frozenset[str]]:
+        return unseen(
+            multi_agent=has_multi_agent,
+            escalation=has_escalation,
+            output_validation=has_output_validation,
+        )
+
+    for f, found in cache.map(_scan_file, code_files, wanted):
+        has_multi_agent = has_multi_agent or found["multi_agent"]
+        has_escalation = has_escalation or found["escalation"]
+        has_output_validation = has_output_validation or found["output_validation"]
+        if found["audit_trail"]:
+            audit_trail_count += 1
 
-        rel_path = str(f.relative_to(project_path))
-
-        # Multi-agent detection
-        for pattern in MULTI_AGENT_PATTERNS:
-            if re.search(pattern, content):
-                has_multi_agent = True
-                break
-
-        # Escalation detection
-        for pattern in ESCALATION_PATTERNS:
-            if re.search(pattern, content):
-                has_escalation = True
-                break
-
-        # Silent error handlers
-        for pattern, desc in SILENT_ERROR_PATTERNS:
-            for match in re.finditer(pattern, content):
-                line_num = content[:match.start()].count("\n") + 1
-                silent_error_hits.append((rel_path, line_num, desc))
-
-        # Output validation
-        for pattern in VALIDATION_PATTERNS:
-            if re.search(pattern, content):
-                has_output_validation = True
-                break
-
-        # Audit trail fields
-        for pattern in AUDIT_TRAIL_PATTERNS:
-            if re.search(pattern, content):
-                audit_trail_count += 1
-                break  # count per-file, not per-pattern
+        # Only the reported hits are resolved to line numbers
+        silent_error_hits.extend((f, offset, desc) for offset, desc in found["silent_error"])
 
     # --- Score and report ---
 
@@ -180,7 +220,7 @@ def check_art22_accountability(project_path: Path, files: list[Path]) -> dict:
     # 3. Silent error handlers
     if silent_error_hits:
         score -= 3
-        locations = [f"{h[0]}:{h[1]}" for h in silent_error_hits[:5]]
+        locations = [cache.location(h[0], h[1], project_path) for h in silent_error_hits[:5]]
         descs = list({h[2] for h in silent_error_hits})
         findings.append({
             "severity": "critical",
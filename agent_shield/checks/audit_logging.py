@@ -1,72 +1,96 @@
 """Check for audit logging and traceability in agent systems."""
-import re
 from pathlib import Path
 
-LOGGING_PATTERNS = [
-    (r'(?i)import\s+logging', "Python logging module", 2),
-    (r'(?i)from\s+logging\s+import', "Python logging module", 2),
-    (r'(?i)structlog|structured.?log', "Structured logging library", 3),
-    (r'(?i)winston|pino|bunyan', "Node.js structured logger", 3),
-    (r'(?i)logger\.(info|warning|error|debug|critical)', "Logger usage", 1),
-    (r'(?i)console\.(log|warn|error|info)', "Console logging (basic)", 1),
-]
-
-AUDIT_PATTERNS = [
-    (r'(?i)audit[_\-]?log|audit[_\-]?trail', "Audit trail reference", 4),
-    (r'(?i)trace[_\-]?id|correlation[_\-]?id|request[_\-]?id', "Trace/correlation ID", 3),
-    (r'(?i)decision[_\-]?log|agent[_\-]?log', "Agent decision logging", 4),
-    (r'(?i)langfuse|langsmith|agentops|phoenix', "Observability platform", 3),
-    (r'(?i)opentelemetry|otel', "OpenTelemetry tracing", 3),
-]
-
-IO_LOGGING_PATTERNS = [
-    (r'(?i)log.*input|log.*prompt|log.*request', "Input logging", 2),
-    (r'(?i)log.*output|log.*response|log.*result', "Output logging", 2),
-    (r'(?i)log.*tool[_\-]?call|log.*function[_\-]?call', "Tool call logging", 2),
-]
-
-def check_audit_logging(project_path: Path, files: list[Path]) -> dict:
+from agent_shield.checks._patterns import fuse, gated_search
+from agent_shield.filecache import FileCache
+from agent_shield.registry import FileScan, register_check
+
+CODE_EXTENSIONS = frozenset({".py", ".js", ".ts", ".jsx", ".tsx"})
+
+# Reported signals, as bits: per-file results and the running total are int masks
+F_BASIC = 1
+F_STRUCTURED = 2
+F_AUDIT = 4
+F_TRACE = 8
+F_IO = 16
+F_OBSERVABILITY = 32
+F_ALL = F_BASIC | F_STRUCTURED | F_AUDIT | F_TRACE | F_IO | F_OBSERVABILITY
+
+LOGGING_PATTERNS = (
+    (r'import\s+logging', "Python logging module", 2, F_BASIC),
+    (r'from\s+logging\s+import', "Python logging module", 2, F_BASIC),
+    (r'structlog|structured.?log', "Structured logging library", 3, F_STRUCTURED),
+    (r'winston|pino|bunyan', "Node.js structured logger", 3, F_STRUCTURED),
+    (r'logger\.(info|warning|error|debug|critical)', "Logger usage", 1, F_BASIC),
+    (r'console\.(log|warn|error|info)', "Console logging (basic)", 1, F_BASIC),
+)
+
+AUDIT_PATTERNS = (
+    (r'audit[_\-]?log|audit[_\-]?trail', "Audit trail reference", 4, F_AUDIT),
+    (r'trace[_\-]?id|correlation[_\-]?id|request[_\-]?id', "Trace/correlation ID", 3, F_TRACE),
+    (r'decision[_\-]?log|agent[_\-]?log', "Agent decision logging", 4, F_AUDIT),
+    (r'langfuse|langsmith|agentops|phoenix', "Observability platform", 3, F_OBSERVABILITY),
+    (r'opentelemetry|otel', "OpenTelemetry tracing", 3, F_AUDIT),
+)
+
+IO_LOGGING_PATTERNS = (
+    (r'log.*input|log.*prompt|log.*request', "Input logging", 2, F_IO),
+    (r'log.*output|log.*response|log.*result', "Output logging", 2, F_IO),
+    (r'log.*tool[_\-]?call|log.*function[_\-]?call', "Tool call logging", 2, F_IO),
+)
+
+
+# One regex per reported signal, fused from every pattern feeding its bit.
+# The patterns are lowercase and searched in the lowercased content.
+SIGNAL_RES = {
+    signal: fuse(
+        p for p, _, _, s in LOGGING_PATTERNS + AUDIT_PATTERNS + IO_LOGGING_PATTERNS
+        if s == signal
+    )
+    for signal in (F_BASIC, F_STRUCTURED, F_AUDIT, F_TRACE, F_IO, F_OBSERVABILITY)
+}
+
+SIGNAL_PREFILTERS = {
+    F_BASIC: ("logging", "logger.", "console."),
+    F_STRUCTURED: ("structlog", "structured", "winston", "pino", "bunyan"),
+    F_AUDIT: ("audit", "decision", "agent", "opentelemetry", "otel"),
+    F_TRACE: ("trace", "correlation", "request"),
+    F_IO: ("log",),
+    F_OBSERVABILITY: ("langfuse", "langsmith", "agentops", "phoenix"),
+}
+
+
+def _scan_file(content: str, wanted: int) -> int:
+    """Return the mask of signals among *wanted* whose regex matches *content*."""
+    lc = content.lower()
+    found = 0
+    for signal, regex in SIGNAL_RES.items():
+        if wanted & signal and gated_search(lc, regex, SIGNAL_PREFILTERS[signal]):
+            found |= signal
+    return found
+
+
+def _select_files(cache: FileCache, files: list[Path], project_path: Path) -> list[Path]:
+    """Return the files this check scans with :func:`_scan_file`."""
+    return cache.select(files, CODE_EXTENSIONS)
+
+
+@register_check("check_audit_logging", FileScan(_select_files, _scan_file, (F_ALL,)))
+def check_audit_logging(project_path: Path, files: list[Path], cache: FileCache | None = None) -> dict:
     """Check for audit logging and traceability. Max 20 points."""
+    if cache is None:
+        cache = FileCache()
     score = 0
     findings = []
-    code_extensions = {".py", ".js", ".ts", ".jsx", ".tsx"}
-
-    has_basic_logging = False
-    has_structured_logging = False
-    has_audit_trail = False
-    has_trace_ids = False
-    has_io_logging = False
-    has_observability = False
-
-    for f in files:
-        if f.suffix not in code_extensions:
-            continue
-        try:
-            content = f.read_text(errors="ignore")
-        except Exception:
-            continue
-
-        for pattern, name, points in LOGGING_PATTERNS:
-            if re.search(pattern, content):
-                if "structured" in name.lower() or name in {"Node.js structured logger"}:
-                    has_structured_logging = True
-                else:
-                    has_basic_logging = True
-
-        for pattern, name, points in AUDIT_PATTERNS:
-            if re.search(pattern, content):
-                if "trace" in name.lower() or "correlation" in name.lower():
-                    has_trace_ids = True
-                elif "observability" in name.lower():
-                    has_observability = True
-                else:
-                    has_audit_trail = True
-
-        for pattern, name, points in IO_LOGGING_PATTERNS:
-            if re.search(pattern, content):
-                has_io_logging = True
-
-    if has_basic_logging:
+
+    flags = 0
+    code_files = _select_files(cache, files, project_path)
+    for _, found in cache.map(_scan_file, code_files, lambda: (F_ALL & ~flags,)):
+        flags |= found
+        if flags == F_ALL:
+            break  # every signal seen — remaining files cannot change the score
+
+    if flags & F_BASIC:
         score += 3
         findings.append({
             "severity": "pass",
@@ -84,7 +108,7 @@ def check_audit_logging(project_path: Path, files: list[Path]) -> dict:
             "articles": ["EU AI Act Art. 12", "EU AI Act Art. 19"],
         })
 
-    if has_structured_logging:
+    if flags & F_STRUCTURED:
         score += 3
         findings.append({
             "severity": "pass",
@@ -93,7 +117,7 @@ def check_audit_logging(project_path: Path, files: list[Path]) -> dict:
             "detail": "Found structured logging library (structlog, winston, pino, or similar).",
         })
 
-    if has_audit_trail:
+    if flags & F_AUDIT:
         score += 5
         findings.append({
             "severity": "pass",
@@ -111,7 +135,7 @@ def check_audit_logging(project_path: Path, files: list[Path]) -> dict:
             "articles": ["EU AI Act Art. 12", "EU AI Act Art. 18"],
         })
 
-    if has_trace_ids:
+    if flags & F_TRACE:
         score += 4
         findings.append({
             "severity": "pass",
@@ -129,7 +153,7 @@ def check_audit_logging(project_path: Path, files: list[Path]) -> dict:
             "articles": ["EU AI Act Art. 12"],
         })
 
-    if has_io_logging:
+    if flags & F_IO:
         score += 3
         findings.append({
             "severity": "pass",
@@ -138,7 +162,7 @@ def check_audit_logging(project_path: Path, files: list[Path]) -> dict:
             "detail": "Found patterns for logging agent inputs and outputs.",
         })
 
-    if has_observability:
+    if flags & F_OBSERVABILITY:
         score += 2
         findings.append({
             "severity": "pass",
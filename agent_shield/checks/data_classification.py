@@ -1,67 +1,94 @@
 """Check for data classification and PII handling practices."""
-import re
 from pathlib import Path
 
-CLASSIFICATION_PATTERNS = [
-    (r'(?i)data[_\-]?classif(y|ication)', "Data classification logic"),
-    (r'(?i)pii|personally[_\-]?identifiable', "PII reference"),
-    (r'(?i)sensitive[_\-]?data|confidential', "Sensitive data label"),
-    (r'(?i)data[_\-]?category|data[_\-]?level|data[_\-]?tier', "Data categorisation"),
-]
-
-PRIVACY_PATTERNS = [
-    (r'(?i)anonymiz(e|ation)|pseudonymiz(e|ation)', "Anonymisation/pseudonymisation"),
-    (r'(?i)redact|mask|obfuscate', "Data redaction"),
-    (r'(?i)encrypt|AES|RSA|fernet', "Encryption usage"),
-    (r'(?i)data[_\-]?retention|retention[_\-]?polic', "Retention policy"),
-    (r'(?i)right[_\-]?to[_\-]?erasure|right[_\-]?to[_\-]?forget|data[_\-]?deletion', "Right to erasure"),
-]
-
-PRIVACY_DOC_FILES = {
+from agent_shield.checks._patterns import fuse, search_groups, unseen
+from agent_shield.filecache import FileCache
+from agent_shield.registry import FileScan, register_check
+
+CODE_EXTENSIONS = frozenset({".py", ".js", ".ts", ".jsx", ".tsx", ".yaml", ".yml"})
+
+# Presence-only groups, lowercase, searched in the lowercased content
+
+CLASSIFICATION_PATTERNS = (
+    (r'data[_\-]?classif(y|ication)', "Data classification logic"),
+    (r'pii|personally[_\-]?identifiable', "PII reference"),
+    (r'sensitive[_\-]?data|confidential', "Sensitive data label"),
+    (r'data[_\-]?category|data[_\-]?level|data[_\-]?tier', "Data categorisation"),
+)
+CLASSIFICATION_RE = fuse(p for p, _ in CLASSIFICATION_PATTERNS)
+
+PRIVACY_PATTERNS = (
+    (r'anonymiz(e|ation)|pseudonymiz(e|ation)', "Anonymisation/pseudonymisation"),
+    (r'redact|mask|obfuscate', "Data redaction"),
+    (r'encrypt|aes|rsa|fernet', "Encryption usage"),
+    (r'data[_\-]?retention|retention[_\-]?polic', "Retention policy"),
+    (r'right[_\-]?to[_\-]?erasure|right[_\-]?to[_\-]?forget|data[_\-]?deletion', "Right to erasure"),
+)
+PRIVACY_RE = fuse(p for p, _ in PRIVACY_PATTERNS)
+
+PRIVACY_DOC_FILES = frozenset({
     "privacy.md", "privacy-policy.md", "data-classification.md",
     "data_classification.md", "dpia.md", "pia.md",
-}
+})
+
+CONSENT_PATTERNS = (
+    (r'consent|opt[_\-]?(in|out)', "Consent mechanism"),
+    (r'gdpr|data[_\-]?protect', "GDPR reference"),
+    (r'data[_\-]?processing[_\-]?agreement|dpa', "DPA reference"),
+)
+CONSENT_RE = fuse(p for p, _ in CONSENT_PATTERNS)
+
+CLASSIFICATION_PREFILTERS = ("data", "pii", "personally", "sensitive", "confidential")
+PRIVACY_PREFILTERS = (
+    "nymiz", "redact", "mask", "obfuscate", "encrypt", "aes", "rsa", "fernet",
+    "retention", "right", "deletion",
+)
+CONSENT_PREFILTERS = ("consent", "opt", "gdpr", "protect", "agreement", "dpa")
 
-CONSENT_PATTERNS = [
-    (r'(?i)consent|opt[_\-]?(in|out)', "Consent mechanism"),
-    (r'(?i)gdpr|data[_\-]?protect', "GDPR reference"),
-    (r'(?i)data[_\-]?processing[_\-]?agreement|dpa', "DPA reference"),
-]
+SIGNAL_RES = (
+    ("classification", CLASSIFICATION_RE, CLASSIFICATION_PREFILTERS),
+    ("privacy_tech", PRIVACY_RE, PRIVACY_PREFILTERS),
+    ("consent", CONSENT_RE, CONSENT_PREFILTERS),
+)
 
 
-def check_data_classification(project_path: Path, files: list[Path]) -> dict:
+def _scan_file(content: str, wanted: frozenset[str]) -> dict:
+    """Report which of the *wanted* pattern groups match *content*."""
+    return search_groups(content.lower(), wanted, SIGNAL_RES)
+
+
+def _select_files(cache: FileCache, files: list[Path], project_path: Path) -> list[Path]:
+    """Return the files this check scans with :func:`_scan_file`."""
+    return cache.select(files, CODE_EXTENSIONS)
+
+
+@register_check(
+    "check_data_classification",
+    FileScan(_select_files, _scan_file, (frozenset(name for name, _, _ in SIGNAL_RES),)),
+)
+def check_data_classification(project_path: Path, files: list[Path], cache: FileCache | None = None) -> dict:
     """Check for data classification and PII handling. Max 15 points."""
+    if cache is None:
+        cache = FileCache()
     score = 0
     findings = []
-    code_extensions = {".py", ".js", ".ts", ".jsx", ".tsx", ".yaml", ".yml"}
 
     has_classification = False
     has_privacy_tech = False
-    has_privacy_doc = False
+    has_privacy_doc = not PRIVACY_DOC_FILES.isdisjoint(cache.lower_names(files))
     has_consent = False
 
-    for f in files:
-        if f.name.lower() in PRIVACY_DOC_FILES:
-            has_privacy_doc = True
-
-        if f.suffix not in code_extensions:
-            continue
-        try:
-            content = f.read_text(errors="ignore")
-        except Exception:
-            continue
-
-        for pattern, name in CLASSIFICATION_PATTERNS:
-            if re.search(pattern, content):
-                has_classification = True
+    code_files = _select_files(cache, files, project_path)
 
-        for pattern, name in PRIVACY_PATTERNS:
-            if re.search(pattern, content):
-                has_privacy_tech = True
+    def wanted() -> tuple[frozenset[str]]:
+        return unseen(classification=has_classification, privacy_tech=has_privacy_tech, consent=has_consent)
 
-        for pattern, name in CONSENT_PATTERNS:
-            if re.search(pattern, content):
-                has_consent = True
+    for _, found in cache.map(_scan_file, code_files, wanted):
+        has_classification = has_classification or found["classification"]
+        has_privacy_tech = has_privacy_tech or found["privacy_tech"]
+        has_consent = has_consent or found["consent"]
+        if has_classification and has_privacy_tech and has_consent:
+            break
 
     if has_classification:
         score += 4
@@ -1,6 +1,13 @@
 """Check for governance-relevant documentation."""
+import os
+import re
 from pathlib import Path
 
+from agent_shield.filecache import FileCache
+from agent_shield.registry import FileScan, register_check
+
+PYTHON_EXTENSIONS = frozenset({".py"})
+
 STANDARD_DOCS = {
     "readme.md": "Project overview",
     "contributing.md": "Contribution guidelines",
@@ -30,17 +37,45 @@ ARCHITECTURE_DOCS = {
 }
 
 
-def check_documentation(project_path: Path, files: list[Path]) -> dict:
+# A string literal opening the first statement of the module or of a block:
+# at the start of the file or on the line after one ending in ":" (a def or
+# class header), with only blank and comment lines in between. Triple-quoted
+# values such as SQL or prompts follow "=" or "(" and do not match. Content
+# keeps its line endings, so "\r" is allowed before each "\n", and a module
+# docstring may follow a BOM. Unlike ast.parse this stays a single linear
+# scan per file.
+DOCSTRING_RE = re.compile(
+    r"""(?:\A\ufeff?|:[ \t\r]*(?:#[^\n]*)?\n)(?:[ \t\r]*(?:#[^\n]*)?\n)*[ \t]*[rRuU]?["']"""
+)
+
+
+def _scan_file(content: str) -> bool:
+    """Return whether *content* contains a module, class or function docstring."""
+    return DOCSTRING_RE.search(content) is not None
+
+
+def _select_files(cache: FileCache, files: list[Path], project_path: Path) -> list[Path]:
+    """Return the files this check scans with :func:`_scan_file`."""
+    return cache.select(files, PYTHON_EXTENSIONS)
+
+
+@register_check("check_documentation", FileScan(_select_files, _scan_file))
+def check_documentation(project_path: Path, files: list[Path], cache: FileCache | None = None) -> dict:
     """Check for governance-relevant documentation. Max 15 points."""
+    if cache is None:
+        cache = FileCache()
     score = 0
     findings = []
 
-    filenames = {f.name.lower() for f in files}
-    dirnames = {d.name.lower() for d in project_path.iterdir() if d.is_dir()}
+    filenames = cache.lower_names(files)
+    # DirEntry.is_dir() answers from the directory listing; only symlinks cost a stat
+    with os.scandir(project_path) as entries:
+        dirnames = {e.name.lower() for e in entries if e.is_dir()}
 
     # Standard project docs (max 4 pts)
-    present = [doc for doc in STANDARD_DOCS if doc in filenames]
-    missing = [doc for doc in STANDARD_DOCS if doc not in filenames]
+    present, missing = [], []
+    for doc in STANDARD_DOCS:
+        (present if doc in filenames else missing).append(doc)
 
     if not missing:
         score += 4
@@ -112,18 +147,9 @@ def check_documentation(project_path: Path, files: list[Path]) -> dict:
         })
 
     # Inline docstrings check (max 2 pts)
-    py_files_with_docstrings = 0
-    py_files_total = 0
-    for f in files:
-        if f.suffix != ".py":
-            continue
-        py_files_total += 1
-        try:
-            content = f.read_text(errors="ignore")
-        except Exception:
-            continue
-        if '"""' in content or "'''" in content:
-            py_files_with_docstrings += 1
+    py_list = _select_files(cache, files, project_path)
+    py_files_total = len(py_list)
+    py_files_with_docstrings = sum(found for _, found in cache.map(_scan_file, py_list))
 
     if py_files_total > 0:
         ratio = py_files_with_docstrings / py_files_total
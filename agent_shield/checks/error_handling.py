@@ -2,63 +2,98 @@
 import re
 from pathlib import Path
 
+from agent_shield.checks._patterns import fuse, search_groups, unseen
+from agent_shield.filecache import FileCache
+from agent_shield.registry import FileScan, register_check
+
+PYTHON_EXTENSIONS = frozenset({".py"})
+
 BARE_EXCEPT = re.compile(r'^\s*except\s*:', re.MULTILINE)
 BROAD_EXCEPT = re.compile(r'except\s+Exception\s*:')
 
-FALLBACK_PATTERNS = [
-    (r'(?i)fallback|graceful[_\-]?degrad', "Fallback / graceful degradation"),
-    (r'(?i)circuit[_\-]?breaker|CircuitBreaker', "Circuit breaker"),
-    (r'(?i)retry|backoff|Retry|tenacity', "Retry / backoff"),
-    (r'(?i)timeout|Timeout', "Timeout handling"),
-]
+FALLBACK_PATTERNS = (
+    (r'fallback|graceful[_\-]?degrad', "Fallback / graceful degradation"),
+    (r'circuit[_\-]?breaker', "Circuit breaker"),
+    (r'retry|backoff|tenacity', "Retry / backoff"),
+    (r'timeout', "Timeout handling"),
+)
+
+BOUNDARY_PATTERNS = (
+    (r'max[_\-]?(retries|attempts|iterations|steps|tokens|loops)', "Loop / resource bounds"),
+    (r'rate[_\-]?limit|throttle', "Rate limiting"),
+    (r'input[_\-]?valid|validate[_\-]?input|sanitiz', "Input validation / sanitisation"),
+)
+
+ERROR_REPORTING_PATTERNS = (
+    (r'sentry|bugsnag|rollbar|airbrake|datadog', "Error reporting service"),
+    (r'error[_\-]?handler|exception[_\-]?handler', "Centralised error handler"),
+)
 
-BOUNDARY_PATTERNS = [
-    (r'(?i)max[_\-]?(retries|attempts|iterations|steps|tokens|loops)', "Loop / resource bounds"),
-    (r'(?i)rate[_\-]?limit|throttle', "Rate limiting"),
-    (r'(?i)input[_\-]?valid|validate[_\-]?input|sanitiz', "Input validation / sanitisation"),
-]
 
-ERROR_REPORTING_PATTERNS = [
-    (r'(?i)sentry|bugsnag|rollbar|airbrake|datadog', "Error reporting service"),
-    (r'(?i)error[_\-]?handler|exception[_\-]?handler', "Centralised error handler"),
-]
+# Presence-only groups, lowercase, searched in the lowercased content
+FALLBACK_RE = fuse(p for p, _ in FALLBACK_PATTERNS)
+BOUNDARY_RE = fuse(p for p, _ in BOUNDARY_PATTERNS)
+ERROR_REPORTING_RE = fuse(p for p, _ in ERROR_REPORTING_PATTERNS)
 
+FALLBACK_PREFILTERS = ("fallback", "graceful", "circuit", "retry", "backoff", "tenacity", "timeout")
+BOUNDARY_PREFILTERS = ("max", "rate", "throttle", "input", "sanitiz")
+ERROR_REPORTING_PREFILTERS = ("sentry", "bugsnag", "rollbar", "airbrake", "datadog", "handler")
 
-def check_error_handling(project_path: Path, files: list[Path]) -> dict:
+SIGNAL_RES = (
+    ("fallback", FALLBACK_RE, FALLBACK_PREFILTERS),
+    ("boundaries", BOUNDARY_RE, BOUNDARY_PREFILTERS),
+    ("error_reporting", ERROR_REPORTING_RE, ERROR_REPORTING_PREFILTERS),
+)
+
+
+def _scan_file(content: str, wanted: frozenset[str]) -> dict:
+    """Count broad/bare excepts in *content* and report which *wanted* signals match.
+
+    The except counts appear in the report, so they are always taken;
+    only the presence signals can be skipped once seen.
+    """
+    lc = content.lower() if wanted else ""
+    return {
+        "bare": len(BARE_EXCEPT.findall(content)),
+        "broad": len(BROAD_EXCEPT.findall(content)),
+        **search_groups(lc, wanted, SIGNAL_RES),
+    }
+
+
+def _select_files(cache: FileCache, files: list[Path], project_path: Path) -> list[Path]:
+    """Return the files this check scans with :func:`_scan_file`."""
+    return cache.select(files, PYTHON_EXTENSIONS)
+
+
+@register_check(
+    "check_error_handling",
+    FileScan(_select_files, _scan_file, (frozenset(name for name, _, _ in SIGNAL_RES),)),
+)
+def check_error_handling(project_path: Path, files: list[Path], cache: FileCache | None = None) -> dict:
     """Check for robust error handling and graceful degradation. Max 15 points."""
+    if cache is None:
+        cache = FileCache()
     score = 0
     findings = []
 
     bare_count = 0
     broad_count = 0
-    py_files = 0
     has_fallback = False
     has_boundaries = False
     has_error_reporting = False
 
-    for f in files:
-        if f.suffix != ".py":
-            continue
-        py_files += 1
-        try:
-            content = f.read_text(errors="ignore")
-        except Exception:
-            continue
-
-        bare_count += len(BARE_EXCEPT.findall(content))
-        broad_count += len(BROAD_EXCEPT.findall(content))
-
-        for pattern, name in FALLBACK_PATTERNS:
-            if re.search(pattern, content):
-                has_fallback = True
-
-        for pattern, name in BOUNDARY_PATTERNS:
-            if re.search(pattern, content):
-                has_boundaries = True
-
-        for pattern, name in ERROR_REPORTING_PATTERNS:
-            if re.search(pattern, content):
-                has_error_reporting = True
+    py_list = _select_files(cache, files, project_path)
+    py_files = len(py_list)
+
+    def wanted() -> tuple[frozenset[str]]:
+        return unseen(fallback=has_fallback, boundaries=has_boundaries, error_reporting=has_error_reporting)
+
+    for _, found in cache.map(_scan_file, py_list, wanted):
+        bare_count += found["bare"]
+        broad_count += found["broad"]
+        has_fallback = has_fallback or found["fallback"]
+        has_boundaries = has_boundaries or found["boundaries"]
+        has_error_reporting = has_error_reporting or found["error_reporting"]
 
     if py_files == 0:
         return {
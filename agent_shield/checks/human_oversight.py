@@ -1,68 +1,103 @@
 """Check for human oversight and control mechanisms."""
-import re
 from pathlib import Path
 
-HITL_PATTERNS = [
-    (r'(?i)human[_\-]?(in[_\-]?the[_\-]?loop|review|approval|confirm)', "Human-in-the-loop", 5),
-    (r'(?i)require[_\-]?approval|needs[_\-]?approval|pending[_\-]?approval', "Approval gate", 5),
-    (r'(?i)manual[_\-]?review|manual[_\-]?check', "Manual review step", 4),
-    (r'(?i)confirm.*before|approve.*before|review.*before', "Pre-action confirmation", 4),
-]
-
-ESCALATION_PATTERNS = [
-    (r'(?i)escalat(e|ion)|elevat(e|ion)', "Escalation logic", 4),
-    (r'(?i)fallback[_\-]?to[_\-]?human|hand[_\-]?off|handoff', "Human handoff", 4),
-    (r'(?i)confidence[_\-]?(score|threshold|level).*(?:low|below|under)', "Confidence-based escalation", 4),
-    (r'(?i)risk[_\-]?(score|level|threshold)', "Risk-based routing", 3),
-]
-
-OVERRIDE_PATTERNS = [
-    (r'(?i)kill[_\-]?switch|emergency[_\-]?stop|abort', "Kill switch", 4),
-    (r'(?i)override|force[_\-]?stop|disable[_\-]?agent', "Override mechanism", 3),
-    (r'(?i)rate[_\-]?limit|throttle|circuit[_\-]?break', "Rate limiting / circuit breaker", 3),
-    (r'(?i)max[_\-]?(retries|attempts|iterations|loops)', "Loop bounds", 2),
-]
-
-EXTERNAL_ACTION_PATTERNS = [
-    (r'(?i)(send|post|publish|deploy|delete|drop|execute).*confirm', "Confirmation before destructive action", 4),
-    (r'(?i)dry[_\-]?run|sandbox|preview', "Dry run / sandbox mode", 3),
-    (r'(?i)allow[_\-]?list|whitelist|permitted[_\-]?actions', "Action allowlisting", 3),
-]
-
-def check_human_oversight(project_path: Path, files: list[Path]) -> dict:
+from agent_shield.checks._patterns import fuse, search_groups, unseen
+from agent_shield.filecache import FileCache
+from agent_shield.registry import FileScan, register_check
+
+CODE_EXTENSIONS = frozenset({".py", ".js", ".ts", ".jsx", ".tsx", ".yaml", ".yml"})
+
+HITL_PATTERNS = (
+    (r'human[_\-]?(in[_\-]?the[_\-]?loop|review|approval|confirm)', "Human-in-the-loop", 5),
+    (r'require[_\-]?approval|needs[_\-]?approval|pending[_\-]?approval', "Approval gate", 5),
+    (r'manual[_\-]?review|manual[_\-]?check', "Manual review step", 4),
+    (r'confirm.*before|approve.*before|review.*before', "Pre-action confirmation", 4),
+)
+
+ESCALATION_PATTERNS = (
+    (r'escalat(e|ion)|elevat(e|ion)', "Escalation logic", 4),
+    (r'fallback[_\-]?to[_\-]?human|hand[_\-]?off|handoff', "Human handoff", 4),
+    (r'confidence[_\-]?(score|threshold|level).*(?:low|below|under)', "Confidence-based escalation", 4),
+    (r'risk[_\-]?(score|level|threshold)', "Risk-based routing", 3),
+)
+
+OVERRIDE_PATTERNS = (
+    (r'kill[_\-]?switch|emergency[_\-]?stop|abort', "Kill switch", 4),
+    (r'override|force[_\-]?stop|disable[_\-]?agent', "Override mechanism", 3),
+    (r'rate[_\-]?limit|throttle|circuit[_\-]?break', "Rate limiting / circuit breaker", 3),
+    (r'max[_\-]?(retries|attempts|iterations|loops)', "Loop bounds", 2),
+)
+
+EXTERNAL_ACTION_PATTERNS = (
+    (r'(send|post|publish|deploy|delete|drop|execute).*confirm', "Confirmation before destructive action", 4),
+    (r'dry[_\-]?run|sandbox|preview', "Dry run / sandbox mode", 3),
+    (r'allow[_\-]?list|whitelist|permitted[_\-]?actions', "Action allowlisting", 3),
+)
+
+
+# Presence-only groups, lowercase, searched in the lowercased content
+HITL_RE = fuse(p for p, _, _ in HITL_PATTERNS)
+ESCALATION_RE = fuse(p for p, _, _ in ESCALATION_PATTERNS)
+OVERRIDE_RE = fuse(p for p, _, _ in OVERRIDE_PATTERNS)
+EXTERNAL_ACTION_RE = fuse(p for p, _, _ in EXTERNAL_ACTION_PATTERNS)
+
+HITL_PREFILTERS = ("human", "approval", "manual", "before")
+ESCALATION_PREFILTERS = ("escalat", "elevat", "hand", "human", "confidence", "risk")
+OVERRIDE_PREFILTERS = (
+    "kill", "emergency", "abort", "override", "force", "disable",
+    "rate", "throttle", "circuit", "max",
+)
+EXTERNAL_ACTION_PREFILTERS = ("confirm", "dry", "sandbox", "preview", "allow", "whitelist", "permitted")
+
+SIGNAL_RES = (
+    ("hitl", HITL_RE, HITL_PREFILTERS),
+    ("escalation", ESCALATION_RE, ESCALATION_PREFILTERS),
+    ("override", OVERRIDE_RE, OVERRIDE_PREFILTERS),
+    ("external_gates", EXTERNAL_ACTION_RE, EXTERNAL_ACTION_PREFILTERS),
+)
+
+
+def _scan_file(content: str, wanted: frozenset[str]) -> dict:
+    """Report which of the *wanted* signal groups match *content*."""
+    return search_groups(content.lower(), wanted, SIGNAL_RES)
+
+
+def _select_files(cache: FileCache, files: list[Path], project_path: Path) -> list[Path]:
+    """Return the files this check scans with :func:`_scan_file`."""
+    return cache.select(files, CODE_EXTENSIONS)
+
+
+@register_check(
+    "check_human_oversight",
+    FileScan(_select_files, _scan_file, (frozenset(name for name, _, _ in SIGNAL_RES),)),
+)
+def check_human_oversight(project_path: Path, files: list[Path], cache: FileCache | None = None) -> dict:
     """Check for human oversight mechanisms. Max 20 points."""
+    if cache is None:
+        cache = FileCache()
     score = 0
     findings = []
-    code_extensions = {".py", ".js", ".ts", ".jsx", ".tsx", ".yaml", ".yml"}
 
     has_hitl = False
     has_escalation = False
     has_override = False
     has_external_gates = False
 
-    for f in files:
-        if f.suffix not in code_extensions:
-            continue
-        try:
-            content = f.read_text(errors="ignore")
-        except Exception:
-            continue
-
-        for pattern, name, points in HITL_PATTERNS:
-            if re.search(pattern, content):
-                has_hitl = True
-
-        for pattern, name, points in ESCALATION_PATTERNS:
-            if re.search(pattern, content):
-                has_escalation = True
-
-        for pattern, name, points in OVERRIDE_PATTERNS:
-            if re.search(pattern, content):
-                has_override = True
-
-        for pattern, name, points in EXTERNAL_ACTION_PATTERNS:
-            if re.search(pattern, content):
-                has_external_gates = True
+    def wanted() -> tuple[frozenset[str]]:
+        return unseen(
+            hitl=has_hitl,
+            escalation=has_escalation,
+            override=has_override,
+            external_gates=has_external_gates,
+        )
+
+    for _, found in cache.map(_scan_file, _select_files(cache, files, project_path), wanted):
+        has_hitl = has_hitl or found["hitl"]
+        has_escalation = has_escalation or found["escalation"]
+        has_override = has_override or found["override"]
+        has_external_gates = has_external_gates or found["external_gates"]
+        if has_hitl and has_escalation and has_override and has_external_gates:
+            break  # every signal seen — remaining files cannot change the score
 
     if has_hitl:
         score += 7
@@ -2,7 +2,13 @@
 import re
 from pathlib import Path
 
-SECRET_PATTERNS = [
+from agent_shield.checks._patterns import fuse, gated_search, unseen
+from agent_shield.filecache import FileCache
+from agent_shield.registry import FileScan, register_check
+
+CODE_EXTENSIONS = frozenset({".py", ".js", ".ts", ".jsx", ".tsx", ".yaml", ".yml", ".toml", ".json"})
+
+SECRET_PATTERNS = (
     (r'(?i)(api[_-]?key|apikey)\s*[=:]\s*["\']?[a-zA-Z0-9_\-]{20,}', "API key"),
     (r'(?i)(secret|password|passwd|pwd)\s*[=:]\s*["\']?[^\s"\']{8,}', "Password/Secret"),
     (r'(?i)(token)\s*[=:]\s*["\']?[a-zA-Z0-9_\-]{20,}', "Token"),
@@ -14,11 +20,11 @@ SECRET_PATTERNS = [
     (r'(?i)(aws_access_key_id|aws_secret_access_key)\s*[=:]\s*[^\s"\']+', "AWS credential"),
     (r'AKIA[0-9A-Z]{16}', "AWS access key ID"),
     (r'-----BEGIN (RSA |EC |DSA )?PRIVATE KEY-----', "Private key"),
-]
+)
 
 SENSITIVE_FILES = {".env", ".env.local", ".env.production", ".env.staging"}
 
-GOOD_PATTERNS = [
+GOOD_PATTERNS = (
     r'os\.environ\.get\(',
     r'os\.getenv\(',
     r'process\.env\.',
@@ -26,48 +32,119 @@ GOOD_PATTERNS = [
     r'vault',
     r'secret_?manager',
     r'key_?vault',
-]
-
-def check_secrets(project_path: Path, files: list[Path]) -> dict:
+)
+
+# Literal anchors per secret pattern; those of (?i) patterns are lowercase,
+# as the pattern is searched in the lowercased content
+SECRET_PREFILTERS = (
+    ("api",),
+    ("secret", "passw", "pwd"),
+    ("token",),
+    ("sk-",),
+    ("sk-ant-",),
+    ("postgres",),
+    ("mysql",),
+    ("mongodb",),
+    ("aws_",),
+    ("AKIA",),
+    ("PRIVATE KEY",),
+)
+
+
+def _compile_secret(pattern: str) -> tuple[re.Pattern, bool]:
+    """Compile *pattern*; a leading (?i) is dropped and the regex flagged for lowercased content."""
+    if pattern.startswith("(?i)"):
+        return re.compile(pattern[4:]), True
+    return re.compile(pattern), False
+
+
+# Secret types are reported per pattern, so each keeps its own compiled regex:
+# (regex, matches lowercased content, secret type, literal anchors)
+SECRET_RES = tuple(
+    (*_compile_secret(p), secret_type, prefilters)
+    for (p, secret_type), prefilters in zip(SECRET_PATTERNS, SECRET_PREFILTERS)
+)
+
+# The good patterns are presence-only and fused per signal
+GOOD_ENV_RE = fuse(GOOD_PATTERNS[:3])
+GOOD_MANAGER_RE = fuse(GOOD_PATTERNS[3:])
+
+# Literal anchors for the good patterns (case-sensitive)
+GOOD_ENV_PREFILTERS = ("environ", "getenv", "process.env")
+GOOD_MANAGER_PREFILTERS = ("dotenv", "vault", "secret")
+
+
+def _scan_file(content: str, wanted: frozenset[str]) -> tuple[tuple[str, ...], bool, bool]:
+    """Scan *content* for secrets and, if *wanted*, for the good practices.
+
+    Returns the type of every secret pattern that matches, in table order,
+    and whether ``"env_vars"`` and ``"secret_manager"`` usage was found.
+    """
+    lc = content.lower()
+    found = []
+    for regex, lower, secret_type, prefilters in SECRET_RES:
+        text = lc if lower else content
+        if gated_search(text, regex, prefilters):
+            found.append(secret_type)
+    uses_env_vars = "env_vars" in wanted and gated_search(content, GOOD_ENV_RE, GOOD_ENV_PREFILTERS)
+    uses_secret_manager = (
+        "secret_manager" in wanted and gated_search(content, GOOD_MANAGER_RE, GOOD_MANAGER_PREFILTERS)
+    )
+    return tuple(found), uses_env_vars, uses_secret_manager
+
+
+def _select_files(cache: FileCache, files: list[Path], project_path: Path) -> list[Path]:
+    """Return the files this check scans with :func:`_scan_file`."""
+    return [
+        f for f in cache.select(files, CODE_EXTENSIONS)
+        if f.name not in {".env.example", ".env.template"}
+    ]
+
+
+@register_check(
+    "check_secrets",
+    FileScan(_select_files, _scan_file, (frozenset({"env_vars", "secret_manager"}),)),
+)
+def check_secrets(project_path: Path, files: list[Path], cache: FileCache | None = None) -> dict:
     """Check for exposed secrets and access control issues. Max 15 points."""
+    if cache is None:
+        cache = FileCache()
     score = 15
     findings = []
-    code_extensions = {".py", ".js", ".ts", ".jsx", ".tsx", ".yaml", ".yml", ".toml", ".json"}
-    secrets_found = []
-
-    for f in files:
-        if f.suffix not in code_extensions:
-            continue
-        if f.name in {".env.example", ".env.template"}:
-            continue
-        try:
-            content = f.read_text(errors="ignore")
-        except Exception:
-            continue
-
-        for pattern, secret_type in SECRET_PATTERNS:
-            matches = re.findall(pattern, content)
-            if matches:
-                rel_path = f.relative_to(project_path)
-                secrets_found.append((rel_path, secret_type))
-
-    if secrets_found:
+    # Only the hit count, the distinct types and the distinct files are reported
+    secret_count = 0
+    secret_types_found: set[str] = set()
+    secret_files: set[str] = set()
+    uses_env_vars = False
+    uses_secret_manager = False
+
+    def wanted() -> tuple[frozenset[str]]:
+        return unseen(env_vars=uses_env_vars, secret_manager=uses_secret_manager)
+
+    candidates = _select_files(cache, files, project_path)
+    for f, (secret_types, env_vars, secret_manager) in cache.map(_scan_file, candidates, wanted):
+        uses_env_vars = uses_env_vars or env_vars
+        uses_secret_manager = uses_secret_manager or secret_manager
+        if secret_types:
+            secret_count += len(secret_types)
+            secret_types_found.update(secret_types)
+            secret_files.add(str(cache.relative(f, project_path)))
+
+    if secret_count:
         score -= 5
-        locations = list({str(s[0]) for s in secrets_found})[:5]
-        types = list({s[1] for s in secrets_found})
+        locations = list(secret_files)[:5]
+        types = list(secret_types_found)
         findings.append({
             "severity": "critical",
             "category": "secrets",
             "title": "Potential secrets found in code",
-            "detail": f"Found {len(secrets_found)} potential secret(s) ({', '.join(types)}) in: {', '.join(locations)}",
+            "detail": f"Found {secret_count} potential secret(s) ({', '.join(types)}) in: {', '.join(locations)}",
             "fix": "Move secrets to environment variables. Use a secrets manager for production.",
             "articles": ["GDPR Art. 32", "EU AI Act Art. 15"],
         })
 
     gitignore_path = project_path / ".gitignore"
-    gitignore_content = ""
-    if gitignore_path.exists():
-        gitignore_content = gitignore_path.read_text(errors="ignore")
+    gitignore_content = cache.read_text(gitignore_path) or ""
 
     env_files_present = [f for f in files if f.name in SENSITIVE_FILES]
     env_in_gitignore = ".env" in gitignore_content
@@ -90,24 +167,6 @@ def check_secrets(project_path: Path, files: list[Path]) -> dict:
             "detail": ".env is listed in .gitignore.",
         })
 
-    uses_env_vars = False
-    uses_secret_manager = False
-
-    for f in files:
-        if f.suffix not in code_extensions:
-            continue
-        try:
-            content = f.read_text(errors="ignore")
-        except Exception:
-            continue
-
-        for pattern in GOOD_PATTERNS[:3]:
-            if re.search(pattern, content):
-                uses_env_vars = True
-        for pattern in GOOD_PATTERNS[3:]:
-            if re.search(pattern, content):
-                uses_secret_manager = True
-
     if not uses_env_vars:
         score -= 3
         findings.append({
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import json
 import logging
 import sys
@@ -10,10 +11,11 @@ from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# The scanner (every check module and its compiled patterns) and the emergency
+# probes are imported by the commands that use them, so --help, --version and
+# the ledger commands start without them.
 from agent_shield import __version__
-from agent_shield.scanner import scan_project
-from agent_shield.frameworks import FRAMEWORKS, get_framework
-from agent_shield.formatters import format_results
+from agent_shield.frameworks import FRAMEWORK_KEYS, get_framework
 from agent_shield.report import (
     query_entries,
     summarize,
@@ -21,10 +23,6 @@ from agent_shield.report import (
     verify_chain,
     DEFAULT_REPORT_PATH,
 )
-from agent_shield.emergency import (
-    assess_emergency,
-    format_emergency_text,
-)
 
 
 def _parse_duration(value: str) -> float:
@@ -39,7 +37,36 @@ def _parse_duration(value: str) -> float:
     return float(value)
 
 
+def _parse_jobs(value: str) -> int:
+    """Parse a worker process count; must be at least 1."""
+    jobs = int(value)
+    if jobs < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return jobs
+
+
+def _parse_size(value: str) -> int:
+    """Parse a size string like '512k', '2M' or '1048576' into bytes."""
+    value = value.strip().lower()
+    multiplier = 1
+    if value.endswith("k"):
+        multiplier, value = 1024, value[:-1]
+    elif value.endswith("m"):
+        multiplier, value = 1024 * 1024, value[:-1]
+    size = int(value) * multiplier
+    if size < 1:
+        raise argparse.ArgumentTypeError("must be at least 1 byte")
+    return size
+
+
+@functools.lru_cache(maxsize=1)
 def build_parser() -> argparse.ArgumentParser:
+    """Return the argument parser, built once per process.
+
+    Parsing does not mutate the parser, so repeated :func:`main` calls
+    share it. The programmatic API is :func:`agent_shield.scanner.scan_project`;
+    :func:`main` is a thin wrapper around it.
+    """
     parser = argparse.ArgumentParser(
         prog="agent-shield",
         description="Governance readiness scanner for AI agent projects.",
@@ -67,7 +94,7 @@ def build_parser() -> argparse.ArgumentParser:
     scan_parser.add_argument(
         "--framework",
         type=str,
-        choices=list(FRAMEWORKS.keys()),
+        choices=FRAMEWORK_KEYS,
         default="all",
         help="Governance framework to check against (default: all).",
     )
@@ -79,6 +106,32 @@ def build_parser() -> argparse.ArgumentParser:
         default="text",
         help="Output format (default: text).",
     )
+    scan_parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Reuse results for unchanged files from the result cache.",
+    )
+    scan_parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        metavar="DIR",
+        help="Directory for the --cache result cache (default: the user cache directory).",
+    )
+    scan_parser.add_argument(
+        "--jobs",
+        type=_parse_jobs,
+        default=None,
+        metavar="N",
+        help="Worker processes for scanning file contents (default: one per CPU core).",
+    )
+    scan_parser.add_argument(
+        "--max-file-size",
+        type=_parse_size,
+        default=None,
+        metavar="SIZE",
+        help="Skip files larger than SIZE, e.g. '512k' or '4M' (default: 2M).",
+    )
 
     # --- report command ---
     report_parser = sub.add_parser(
@@ -235,6 +288,10 @@ def main(argv: list[str] | None = None) -> int:
         return 0
 
     if args.command == "scan":
+        from agent_shield.filecache import MAX_FILE_SIZE
+        from agent_shield.formatters import write_results
+        from agent_shield.scanner import scan_project
+
         project_path = Path(args.path).resolve()
         if not project_path.is_dir():
             print(f"Error: '{project_path}' is not a directory.", file=sys.stderr)
@@ -242,9 +299,16 @@ def main(argv: list[str] | None = None) -> int:
 
         framework = get_framework(args.framework)
         logger.info("Scanning %s with framework '%s'", project_path, framework.name)
-        results = scan_project(project_path, framework)
-        output = format_results(results, args.output_format)
-        print(output)
+        results = scan_project(
+            project_path,
+            framework,
+            use_cache=args.cache,
+            jobs=args.jobs,
+            max_file_size=args.max_file_size or MAX_FILE_SIZE,
+            cache_dir=Path(args.cache_dir) if args.cache_dir else None,
+        )
+        write_results(results, args.output_format, sys.stdout)
+        sys.stdout.write("\n")
 
         # Exit code: 0 if percentage >= 70, 1 otherwise (useful for CI gates)
         return 0 if results["pct"] >= 70 else 1
@@ -283,6 +347,8 @@ def main(argv: list[str] | None = None) -> int:
     if args.command == "status":
         gov_path = Path(args.governance)
         if args.emergency:
+            from agent_shield.emergency import assess_emergency, format_emergency_text
+
             result = assess_emergency(gov_path)
 
             if args.output_format == "json":
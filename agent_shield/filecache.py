@@ -0,0 +1,286 @@
+"""Per-scan file cache shared by all check modules."""
+
+from __future__ import annotations
+
+import logging
+import mmap
+import os
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import chain, repeat
+from pathlib import Path
+from typing import Any, TypeVar
+
+from agent_shield.lineindex import LineIndex
+from agent_shield.resultcache import MISSING, ResultCache, content_digest
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Below this many files, fanning out to worker processes costs more than it saves
+PARALLEL_MIN_FILES = 64
+
+# Default cap: files above this size are generated bundles or data dumps, not reviewable source
+MAX_FILE_SIZE = 2 * 1024 * 1024
+
+# A NUL byte in the first block marks a file as binary
+BINARY_SNIFF_BYTES = 4096
+
+# Files at least this large are decoded straight from a memory map
+MMAP_THRESHOLD = 1024 * 1024
+
+
+def _read_text(path: Path, max_size: int = MAX_FILE_SIZE) -> str | None:
+    """Decode *path*, or return None if it is unreadable, larger than *max_size* bytes or binary."""
+    # Decoding is cheap next to matching (UTF-8 source is almost all ASCII,
+    # which decodes at memcpy speed), and bytes patterns run no faster than
+    # str ones, so checks keep working on str.
+    try:
+        with path.open("rb") as fh:
+            size = os.fstat(fh.fileno()).st_size
+            if size > max_size:
+                return None
+            if size >= MMAP_THRESHOLD:
+                # Decoding from the page cache skips the intermediate bytes copy
+                with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    if data.find(b"\0", 0, BINARY_SNIFF_BYTES) != -1:
+                        return None
+                    return str(data, "utf-8", "ignore")
+            data = fh.read()
+    except (OSError, ValueError):
+        return None
+    if data.find(b"\0", 0, BINARY_SNIFF_BYTES) != -1:
+        return None
+    return data.decode("utf-8", errors="ignore")
+
+
+class FileCache:
+    """Read each file at most once per scan and hand the content to every check.
+
+    ``scan_project`` builds one cache and passes it to each check, so a
+    file looked at by several checks is read and decoded a single time.
+    Files that are unreadable, larger than *max_file_size* bytes (default
+    ``MAX_FILE_SIZE``) or binary are remembered as ``None`` and skipped by
+    every check. Extension filtering and path relativization are memoized
+    too; a cache serves one project root.
+
+    *jobs* is the number of worker processes :meth:`map` may use; ``1``
+    (the default) keeps all work in-process and ``None`` uses every core.
+    If the pool cannot be created (no working multiprocessing semaphores,
+    as on AWS Lambda), the cache logs a warning and stays in-process.
+    With a *results* cache, :meth:`map` reuses stored results for files
+    whose content is unchanged since an earlier run instead of scanning them.
+    """
+
+    def __init__(
+        self,
+        jobs: int | None = 1,
+        results: ResultCache | None = None,
+        max_file_size: int = MAX_FILE_SIZE,
+    ) -> None:
+        self.jobs = jobs if jobs is not None else (os.cpu_count() or 1)
+        self.results = results
+        self.max_file_size = max_file_size
+        self._text: dict[Path, str | None] = {}
+        self._digests: dict[Path, str] = {}
+        self._lines: dict[Path, LineIndex] = {}
+        self._relative: dict[Path, Path] = {}
+        self._selected: dict[tuple[int, frozenset[str]], tuple[list[Path], list[Path]]] = {}
+        self._buckets: dict[int, tuple[list[Path], dict[str, list[int]]]] = {}
+        self._names: dict[int, tuple[list[Path], frozenset[str]]] = {}
+        self._pool: Executor | None = None
+        self._preloaded: dict[Callable, dict[Path, Any]] = {}
+
+    def __enter__(self) -> FileCache:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the worker pool, if one was started."""
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def read_text(self, path: Path) -> str | None:
+        """Return the decoded content of *path*, or None if it should not be scanned."""
+        try:
+            return self._text[path]
+        except KeyError:
+            content = self._text[path] = _read_text(path, self.max_file_size)
+            return content
+
+    def prefetch(self, files: Iterable[Path]) -> None:
+        """Read every not-yet-cached file in *files* using a pool of I/O threads.
+
+        File reads release the GIL, so issuing them concurrently overlaps
+        disk latency on cold caches instead of paying it one file at a time.
+        """
+        missing = [f for f in files if f not in self._text]
+        if len(missing) < PARALLEL_MIN_FILES:
+            for f in missing:
+                self.read_text(f)
+            return
+        with ThreadPoolExecutor() as io_pool:
+            for f, content in zip(missing, io_pool.map(_read_text, missing, repeat(self.max_file_size))):
+                self._text[f] = content
+
+    def digest(self, path: Path) -> str | None:
+        """Return the SHA-256 digest of the content of *path*, or None if it is not scanned."""
+        digest = self._digests.get(path)
+        if digest is None:
+            content = self.read_text(path)
+            if content is None:
+                return None
+            digest = self._digests[path] = content_digest(content)
+        return digest
+
+    def lines(self, path: Path) -> LineIndex:
+        """Return the (lazily built) line index for the content of *path*."""
+        index = self._lines.get(path)
+        if index is None:
+            index = self._lines[path] = LineIndex(self.read_text(path) or "")
+        return index
+
+    def select(self, files: list[Path], suffixes: frozenset[str]) -> list[Path]:
+        """Return the members of *files* whose suffix is in *suffixes*, in order.
+
+        Checks that share an extension set filter the project once per scan.
+        *files* is bucketed by suffix once, so each further extension set
+        only touches the files it selects.
+        """
+        key = (id(files), suffixes)
+        entry = self._selected.get(key)
+        if entry is None or entry[0] is not files:
+            buckets = self._buckets_of(files)
+            runs = [buckets[suffix] for suffix in suffixes if suffix in buckets]
+            # Each bucket is ascending; sorting the concatenation merges the runs
+            indexes = runs[0] if len(runs) == 1 else sorted(chain.from_iterable(runs))
+            entry = self._selected[key] = (files, [files[i] for i in indexes])
+        return entry[1]
+
+    def _buckets_of(self, files: list[Path]) -> dict[str, list[int]]:
+        """Return the positions in *files* of the files with each suffix."""
+        entry = self._buckets.get(id(files))
+        if entry is None or entry[0] is not files:
+            buckets: dict[str, list[int]] = {}
+            for i, f in enumerate(files):
+                buckets.setdefault(f.suffix, []).append(i)
+            entry = self._buckets[id(files)] = (files, buckets)
+        return entry[1]
+
+    def lower_names(self, files: list[Path]) -> frozenset[str]:
+        """Return the lowercased file names in *files*, computed once per file list."""
+        entry = self._names.get(id(files))
+        if entry is None or entry[0] is not files:
+            entry = self._names[id(files)] = (files, frozenset(f.name.lower() for f in files))
+        return entry[1]
+
+    def relative(self, path: Path, root: Path) -> Path:
+        """Return *path* relative to the project *root*."""
+        rel = self._relative.get(path)
+        if rel is None:
+            rel = self._relative[path] = path.relative_to(root)
+        return rel
+
+    def location(self, path: Path, offset: int, root: Path) -> str:
+        """Return ``"<path relative to root>:<line>"`` for a match at *offset* in *path*."""
+        return f"{self.relative(path, root)}:{self.lines(path).line_of(offset)}"
+
+    def parallel(self, n_files: int) -> bool:
+        """Return whether :meth:`map` would spread *n_files* files over the worker pool."""
+        return self.jobs != 1 and n_files >= PARALLEL_MIN_FILES
+
+    def _start_pool(self) -> bool:
+        """Start the worker pool if needed; on failure switch to in-process and return False."""
+        if self._pool is None:
+            try:
+                self._pool = ProcessPoolExecutor(max_workers=self.jobs)
+            except (OSError, NotImplementedError, ImportError) as exc:
+                logger.warning("Worker processes unavailable (%s); scanning in-process", exc)
+                self.jobs = 1
+                return False
+        return True
+
+    def preload(self, fn: Callable, path: Path, result: Any) -> None:
+        """Record *result* as what :meth:`map` yields for ``fn`` on *path*."""
+        self._preloaded.setdefault(fn, {})[path] = result
+
+    def map(
+        self,
+        fn: Callable[..., T],
+        files: Iterable[Path],
+        extra: Callable[[], tuple] = tuple,
+    ) -> Iterator[tuple[Path, T]]:
+        """Yield ``(path, fn(content, *extra()))`` for every readable file in *files*.
+
+        *fn* must be a module-level function so it can run in a worker
+        process. Small batches run inline and call *extra* before each file,
+        which lets a check stop asking for signals it has already found.
+        Large batches are spread over the pool with *extra* evaluated once.
+        Preloaded and cached (see :class:`ResultCache`) results are
+        returned as stored. Results keep the order of *files*, and leaving
+        the loop early cancels work that has not started yet.
+        """
+        files = list(files)
+        preloaded = self._preloaded.get(fn)
+        if preloaded:
+            missing = [f for f in files if f not in preloaded]
+            computed = dict(self._map(fn, missing, extra)) if missing else {}
+            for f in files:
+                if f in preloaded:
+                    yield f, preloaded[f]
+                elif f in computed:
+                    yield f, computed[f]
+            return
+        yield from self._map(fn, files, extra)
+
+    def _map(
+        self,
+        fn: Callable[..., T],
+        files: list[Path],
+        extra: Callable[[], tuple],
+    ) -> Iterator[tuple[Path, T]]:
+        results = self.results
+        if not (self.parallel(len(files)) and self._start_pool()):
+            for f in files:
+                content = self.read_text(f)
+                if content is None:
+                    continue
+                args = extra()
+                key = results.key(fn, self.digest(f), args) if results is not None else None
+                if key is not None and (hit := results.get(key)) is not MISSING:
+                    yield f, hit
+                    continue
+                result = fn(content, *args)
+                if key is not None:
+                    results.put(key, result)
+                yield f, result
+            return
+
+        args = extra()
+        self.prefetch(files)
+        keys: dict[Path, str] = {}
+        hits: dict[Path, object] = {}
+        if results is not None:
+            for f in files:
+                if self._text[f] is None:
+                    continue
+                key = keys[f] = results.key(fn, self.digest(f), args)
+                if (hit := results.get(key)) is not MISSING:
+                    hits[f] = hit
+        batch = [f for f in files if f not in hits and self._text[f] is not None]
+        computed: Iterator[T] = iter(())
+        if batch:
+            contents = [self._text[f] for f in batch]
+            computed = self._pool.map(fn, contents, *([arg] * len(batch) for arg in args), chunksize=16)
+        for f in files:
+            if f in hits:
+                yield f, hits[f]
+            elif self._text[f] is not None:
+                result = next(computed)
+                if (key := keys.get(f)) is not None:
+                    results.put(key, result)
+                yield f, result
@@ -2,73 +2,107 @@
 
 from __future__ import annotations
 
+import io
 import json
-from typing import Any
+import re
+from typing import Any, TextIO
+
+try:
+    import orjson
+except ImportError:  # optional: pip install agent-shield[fast]
+    orjson = None
 
 SEVERITY_ICON_TEXT = {"pass": "[PASS]", "warning": "[WARN]", "critical": "[CRIT]"}
 SEVERITY_ICON_MD = {"pass": "\u2705", "warning": "\u26a0\ufe0f", "critical": "\u274c"}
 
+# Keeps a finding inside its markdown table cell
+_MD_ESCAPE = str.maketrans({"|": "\\|", "\n": " "})
+
+_NON_ASCII = re.compile(r"[^\x00-\x7f]")
+
+
+def _json_escape(match: re.Match[str]) -> str:
+    # json.dumps(ensure_ascii=True) form: astral characters as a surrogate pair
+    code = ord(match.group())
+    if code < 0x10000:
+        return f"\\u{code:04x}"
+    code -= 0x10000
+    return f"\\u{0xd800 | code >> 10:04x}\\u{0xdc00 | code & 0x3ff:04x}"
+
 
 def format_results(results: dict[str, Any], fmt: str) -> str:
+    buf = io.StringIO()
+    write_results(results, fmt, buf)
+    return buf.getvalue()
+
+
+def write_results(results: dict[str, Any], fmt: str, out: TextIO) -> None:
+    """Write the formatted *results* to *out*, without a trailing newline."""
     if fmt == "json":
-        return _format_json(results)
-    if fmt == "markdown":
-        return _format_markdown(results)
-    return _format_text(results)
+        _format_json(results, out)
+    elif fmt == "markdown":
+        _format_markdown(results, out)
+    else:
+        _format_text(results, out)
 
 
-def _format_text(results: dict[str, Any]) -> str:
-    lines: list[str] = []
-    lines.append(f"agent-shield scan  |  framework: {results['framework']}")
-    lines.append(f"Project: {results['project']}")
-    lines.append("=" * 64)
+def _format_text(results: dict[str, Any], out: TextIO) -> None:
+    w = out.write
+    w(f"agent-shield scan  |  framework: {results['framework']}\n")
+    w(f"Project: {results['project']}\n")
+    w("=" * 64 + "\n")
 
     for check in results["checks"]:
-        lines.append(f"\n  {check.get('icon', '#')} {check['name']}  ({check['score']}/{check['max_score']})")
+        w(f"\n  {check.get('icon', '#')} {check['name']}  ({check['score']}/{check['max_score']})\n")
         for finding in check.get("findings", []):
             icon = SEVERITY_ICON_TEXT.get(finding["severity"], "[???]")
-            lines.append(f"    {icon} {finding['title']}")
-            lines.append(f"           {finding['detail']}")
+            w(f"    {icon} {finding['title']}\n")
+            w(f"           {finding['detail']}\n")
             if "fix" in finding:
-                lines.append(f"           Fix: {finding['fix']}")
+                w(f"           Fix: {finding['fix']}\n")
             if "articles" in finding and finding["articles"]:
-                lines.append(f"           Ref: {', '.join(finding['articles'])}")
+                w(f"           Ref: {', '.join(finding['articles'])}\n")
 
-    lines.append("\n" + "=" * 64)
+    w("\n" + "=" * 64 + "\n")
     s = results["summary"]
-    lines.append(
+    w(
         f"Score: {results['score']}/{results['max_score']} ({results['pct']}%)  "
         f"|  passed: {s['passed']}  warnings: {s['warnings']}  critical: {s['critical']}"
     )
-    return "\n".join(lines)
 
 
-def _format_json(results: dict[str, Any]) -> str:
-    return json.dumps(results, indent=2, default=str)
+def _format_json(results: dict[str, Any], out: TextIO) -> None:
+    if orjson is not None:
+        # Same document, encoded in C. orjson writes non-ASCII as UTF-8; escape
+        # it as json.dumps does, so the output stays ASCII on any console encoding
+        text = orjson.dumps(results, option=orjson.OPT_INDENT_2, default=str).decode()
+        out.write(_NON_ASCII.sub(_json_escape, text))
+    else:
+        out.write(json.dumps(results, indent=2, default=str))
 
 
-def _format_markdown(results: dict[str, Any]) -> str:
-    lines: list[str] = []
-    lines.append("# agent-shield scan")
-    lines.append(f"**Framework:** {results['framework']}  ")
-    lines.append(f"**Project:** `{results['project']}`  ")
-    lines.append(f"**Score:** {results['score']}/{results['max_score']} ({results['pct']}%)\n")
+def _format_markdown(results: dict[str, Any], out: TextIO) -> None:
+    w = out.write
+    w("# agent-shield scan\n")
+    w(f"**Framework:** {results['framework']}  \n")
+    w(f"**Project:** `{results['project']}`  \n")
+    w(f"**Score:** {results['score']}/{results['max_score']} ({results['pct']}%)\n\n")
 
     for check in results["checks"]:
-        lines.append(f"## {check.get('icon', '#')} {check['name']}  ({check['score']}/{check['max_score']})\n")
-        lines.append("| Status | Finding | Detail |")
-        lines.append("|--------|---------|--------|")
+        w(f"## {check.get('icon', '#')} {check['name']}  ({check['score']}/{check['max_score']})\n\n")
+        w("| Status | Finding | Detail |\n")
+        w("|--------|---------|--------|\n")
         for finding in check.get("findings", []):
             icon = SEVERITY_ICON_MD.get(finding["severity"], "\u2753")
-            detail = finding["detail"]
             if "fix" in finding:
-                detail += f" **Fix:** {finding['fix']}"
-            lines.append(f"| {icon} | {finding['title']} | {detail} |")
-        lines.append("")
+                detail = f"{finding['detail']} **Fix:** {finding['fix']}"
+            else:
+                detail = finding["detail"]
+            w(f"| {icon} | {finding['title'].translate(_MD_ESCAPE)} | {detail.translate(_MD_ESCAPE)} |\n")
+        w("\n")
 
     s = results["summary"]
-    lines.append(
+    w(
         f"---\n**Total: {results['score']}/{results['max_score']} ({results['pct']}%)** — "
         f"passed: {s['passed']}, warnings: {s['warnings']}, critical: {s['critical']}"
     )
-    return "\n".join(lines)
@@ -9,19 +9,19 @@ from dataclasses import dataclass, field
 class Framework:
     name: str
     description: str
-    checks: list[str] = field(default_factory=list)
+    checks: frozenset[str] = field(default_factory=frozenset)
 
 
 FRAMEWORKS: dict[str, Framework] = {
     "all": Framework(
         name="all",
         description="Run every available check.",
-        checks=[],  # empty means run all
+        checks=frozenset(),  # empty means run all
     ),
     "eu-ai-act": Framework(
         name="eu-ai-act",
         description="EU Artificial Intelligence Act compliance checks.",
-        checks=[
+        checks=frozenset({
             "check_human_oversight",
             "check_audit_logging",
             "check_error_handling",
@@ -29,33 +29,33 @@ FRAMEWORKS: dict[str, Framework] = {
             "check_data_classification",
             "check_art14_human_oversight",
             "check_art22_accountability",
-        ],
+        }),
     ),
     "gdpr": Framework(
         name="gdpr",
         description="GDPR data-protection focused checks.",
-        checks=[
+        checks=frozenset({
             "check_secrets",
             "check_data_classification",
             "check_audit_logging",
             "check_documentation",
             "check_art22_accountability",
-        ],
+        }),
     ),
     "owasp-llm": Framework(
         name="owasp-llm",
         description="OWASP Top 10 for LLM Applications.",
-        checks=[
+        checks=frozenset({
             "check_secrets",
             "check_error_handling",
             "check_human_oversight",
             "check_audit_logging",
-        ],
+        }),
     ),
     "nist-ai-rmf": Framework(
         name="nist-ai-rmf",
         description="NIST AI Risk Management Framework.",
-        checks=[
+        checks=frozenset({
             "check_human_oversight",
             "check_audit_logging",
             "check_error_handling",
@@ -64,11 +64,14 @@ FRAMEWORKS: dict[str, Framework] = {
             "check_secrets",
             "check_art14_human_oversight",
             "check_art22_accountability",
-        ],
+        }),
     ),
 }
 
 
+FRAMEWORK_KEYS: tuple[str, ...] = tuple(FRAMEWORKS)
+
+
 def get_framework(name: str) -> Framework:
     """Return a Framework by name, defaulting to 'all'."""
     return FRAMEWORKS.get(name, FRAMEWORKS["all"])
@@ -0,0 +1,28 @@
+"""Offset → line number lookups for scanned file content."""
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_left
+
+_NEWLINE = re.compile("\n")
+
+
+class LineIndex:
+    """Map character offsets in *content* to 1-based line numbers.
+
+    Newline offsets are collected once, on the first lookup, so each hit
+    costs a binary search instead of counting newlines from the start of
+    the file.
+    """
+
+    __slots__ = ("_content", "_newlines")
+
+    def __init__(self, content: str) -> None:
+        self._content = content
+        self._newlines: list[int] | None = None
+
+    def line_of(self, offset: int) -> int:
+        if self._newlines is None:
+            self._newlines = [m.start() for m in _NEWLINE.finditer(self._content)]
+        return bisect_left(self._newlines, offset) + 1
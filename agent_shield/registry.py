@@ -0,0 +1,52 @@
+"""Registry of the governance checks run by ``scan_project``."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+# check_fn(project_path, files, cache) -> result dict
+CheckFunction = Callable[..., dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class FileScan:
+    """How a check scans file contents, for the fused pass in ``prescan``.
+
+    *select* is ``select(cache, files, project_path)`` and returns the files
+    the check reads; *scan* is the module-level ``scan(content, *args)``
+    the check passes to ``FileCache.map``; *args* are the arguments that
+    request every signal.
+    """
+
+    select: Callable[..., list]
+    scan: Callable[..., Any]
+    args: tuple = ()
+
+
+_REGISTRY: dict[str, tuple[CheckFunction, FileScan | None]] = {}
+
+
+def register_check(name: str, file_scan: FileScan | None = None) -> Callable[[CheckFunction], CheckFunction]:
+    """Register the decorated function as the check *name*.
+
+    *name* is what frameworks list in ``Framework.checks``. Checks run in
+    registration order, i.e. the import order in ``agent_shield.checks``.
+    A check that scans file contents through ``FileCache.map`` passes its
+    *file_scan*, so parallel scans fuse it with the other checks' passes.
+    """
+    def decorator(fn: CheckFunction) -> CheckFunction:
+        _REGISTRY[name] = (fn, file_scan)
+        return fn
+    return decorator
+
+
+def registered_checks() -> list[tuple[CheckFunction, str]]:
+    """Return ``(check_function, name)`` for every registered check, in order."""
+    return [(fn, name) for name, (fn, _) in _REGISTRY.items()]
+
+
+def registered_file_scans() -> dict[str, FileScan]:
+    """Return ``{name: file_scan}`` for every registered check that scans file contents."""
+    return {name: file_scan for name, (_, file_scan) in _REGISTRY.items() if file_scan is not None}
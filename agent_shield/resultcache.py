@@ -0,0 +1,132 @@
+"""On-disk cache of per-file scan results, reused across runs."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sys
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from agent_shield import __version__
+
+logger = logging.getLogger(__name__)
+
+MISSING = object()
+
+
+def default_cache_dir() -> Path:
+    """Return the per-user cache directory for agent-shield.
+
+    The cache never lives inside a scanned project: a project could
+    otherwise ship its own stored results and choose its own verdicts.
+    """
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "agent-shield"
+
+
+def _normalize(arg: Any) -> Any:
+    # Set iteration order depends on the hash seed, and a function's repr holds
+    # its address; sort sets and name functions so keys are stable across runs
+    if isinstance(arg, (set, frozenset)):
+        return sorted(arg)
+    if isinstance(arg, tuple):
+        return tuple(_normalize(a) for a in arg)
+    if callable(arg):
+        return f"{arg.__module__}.{arg.__qualname__}"
+    return arg
+
+
+def _code_fingerprint() -> str:
+    """Return a SHA-256 over the source of every module in ``agent_shield.checks``.
+
+    The per-file scan functions and their pattern tables live there, and an
+    editable or git install can change them without a new ``__version__``.
+    """
+    digest = hashlib.sha256()
+    for path in sorted((Path(__file__).parent / "checks").glob("*.py")):
+        try:
+            source = path.read_bytes()
+        except OSError:
+            continue
+        digest.update(path.name.encode() + b"\0" + source)
+    return digest.hexdigest()
+
+
+# Computed once per process; a cache written by other scanning code is discarded
+CODE_FINGERPRINT = _code_fingerprint()
+
+
+def content_digest(content: str) -> str:
+    """Return the SHA-256 hex digest of decoded file *content*."""
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+class ResultCache:
+    """Per-file results keyed by ``(function, SHA-256 of content, arguments)``.
+
+    A file whose content is unchanged since the last run gets its stored
+    result back without being scanned, whatever its modification time.
+    A CI job hits the cache only if it restores the cache directory from
+    its own cache storage; the cache is never read from the scanned
+    project. Files with identical content share one entry. Results must
+    be JSON-serializable; tuples come back as lists. The whole cache is
+    discarded when the agent-shield version or the check code (see
+    :data:`CODE_FINGERPRINT`) changes, and :meth:`save` keeps only the
+    entries used by the current run.
+    """
+
+    def __init__(self, directory: Path, project_path: Path) -> None:
+        # One file per scanned project, so scanning one project does not
+        # evict the entries of another
+        project_id = hashlib.sha256(os.fsencode(project_path.resolve())).hexdigest()[:16]
+        self.path = directory / f"results-{project_id}.json"
+        self._old: dict[str, Any] = {}
+        self._new: dict[str, Any] = {}
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return
+        if (
+            isinstance(data, dict)
+            and data.get("version") == __version__
+            and data.get("code") == CODE_FINGERPRINT
+        ):
+            self._old = data.get("entries") or {}
+
+    @staticmethod
+    def key(fn: Callable, digest: str, args: tuple) -> str:
+        """Return the cache key for ``fn(content, *args)``, given the :func:`content_digest` of content."""
+        args_repr = repr(tuple(_normalize(a) for a in args))
+        return f"{fn.__module__}.{fn.__qualname__}|{digest}|{args_repr}"
+
+    def get(self, key: str) -> Any:
+        """Return the stored result for *key*, or ``MISSING``."""
+        value = self._new.get(key, MISSING)
+        if value is MISSING:
+            value = self._old.get(key, MISSING)
+            if value is not MISSING:
+                self._new[key] = value
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        self._new[key] = value
+
+    def save(self) -> None:
+        """Write the entries used by this run, replacing the previous cache file."""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            header = {"version": __version__, "code": CODE_FINGERPRINT}
+            tmp.write_text(json.dumps({**header, "entries": self._new}))
+            os.replace(tmp, self.path)
+        except OSError as exc:
+            logger.warning("Could not write result cache %s: %s", self.path, exc)
@@ -3,71 +3,112 @@
 from __future__ import annotations
 
 import logging
+import os
+from collections import Counter
 from pathlib import Path
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
-from agent_shield.checks.secrets import check_secrets
-from agent_shield.checks.audit_logging import check_audit_logging
-from agent_shield.checks.human_oversight import check_human_oversight
-from agent_shield.checks.data_classification import check_data_classification
-from agent_shield.checks.error_handling import check_error_handling
-from agent_shield.checks.documentation import check_documentation
-from agent_shield.checks.art14_human_oversight import check_art14_human_oversight
-from agent_shield.checks.art22_accountability import check_art22_accountability
+from agent_shield.checks._unified_scanner import prescan
+from agent_shield.filecache import MAX_FILE_SIZE, FileCache
+from agent_shield.resultcache import ResultCache, default_cache_dir
 from agent_shield.frameworks import Framework
+from agent_shield.registry import registered_checks
 
 
-# Registry: (check_function, function_name_for_framework_filtering)
-ALL_CHECKS = [
-    (check_secrets, "check_secrets"),
-    (check_audit_logging, "check_audit_logging"),
-    (check_human_oversight, "check_human_oversight"),
-    (check_data_classification, "check_data_classification"),
-    (check_error_handling, "check_error_handling"),
-    (check_documentation, "check_documentation"),
-    (check_art14_human_oversight, "check_art14_human_oversight"),
-    (check_art22_accountability, "check_art22_accountability"),
-]
+EXCLUDED_DIRS = {"node_modules", "__pycache__", "dist", "build", ".venv", "venv", ".tox", ".mypy_cache"}
 
+# Minified bundles and source maps are build output, never hand-written source
+EXCLUDED_SUFFIXES = (".min.js", ".min.css", ".map")
 
-EXCLUDED_DIRS = {"node_modules", "__pycache__", "dist", "build", ".venv", "venv", ".tox", ".mypy_cache"}
+
+def _excluded(name: str) -> bool:
+    return name.startswith(".") or name in EXCLUDED_DIRS
 
 
 def _collect_files(project_path: Path) -> list[Path]:
-    """Collect all non-hidden, non-vendored files in the project tree."""
+    """Collect all non-hidden, non-vendored files in the project tree.
+
+    Hidden and vendored directories are pruned rather than walked and
+    filtered, and file types come from the directory listing, so a
+    regular file costs no stat. Files are returned in the order
+    ``Path.rglob`` yields them: each directory's entries, then its
+    subdirectories depth-first. Symlinked directories are not followed.
+    """
     files: list[Path] = []
-    for item in project_path.rglob("*"):
-        parts = item.relative_to(project_path).parts
-        if item.is_file() and not any(p.startswith(".") or p in EXCLUDED_DIRS for p in parts):
-            files.append(item)
+    pending = [os.fspath(project_path)]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        subdirs = []
+        for entry in entries:
+            name = entry.name
+            if _excluded(name):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+            elif entry.is_file() and not name.endswith(EXCLUDED_SUFFIXES):
+                files.append(Path(entry.path))
+        pending.extend(reversed(subdirs))
     return files
 
 
-def scan_project(project_path: Path, framework: Framework) -> dict[str, Any]:
-    """Run all applicable checks and return a structured results dict."""
+def scan_project(
+    project_path: Path,
+    framework: Framework,
+    use_cache: bool = False,
+    jobs: int | None = 1,
+    max_file_size: int = MAX_FILE_SIZE,
+    cache_dir: Path | None = None,
+) -> dict[str, Any]:
+    """Run all applicable checks and return a structured results dict.
+
+    With *use_cache*, per-file results are stored in *cache_dir* (default:
+    :func:`~agent_shield.resultcache.default_cache_dir`, never inside the
+    project) and reused for files unchanged on the next run.
+    *jobs* caps the worker processes used for large file sets; ``1`` (the
+    default) scans in-process and ``None`` uses one per CPU core. Where
+    worker processes cannot be started the scan falls back to in-process.
+    Files larger than *max_file_size* bytes are skipped by every check.
+    """
     files = _collect_files(project_path)
     logger.info("Scanning %s (%d files)", project_path, len(files))
 
-    check_results: list[dict[str, Any]] = []
-    for check_fn, check_name in ALL_CHECKS:
-        # Skip checks not relevant to the selected framework
-        if framework.name != "all" and check_name not in framework.checks:
-            continue
-        result = check_fn(project_path, files)
-        logger.debug("Check %s: %d/%d", check_name, result["score"], result["max_score"])
-        check_results.append(result)
+    result_cache = ResultCache(cache_dir or default_cache_dir(), project_path) if use_cache else None
 
-    total_score = sum(r["score"] for r in check_results)
-    total_max = sum(r["max_score"] for r in check_results)
+    check_results: list[dict[str, Any]] = []
+    # Read the registry per scan, so checks registered after import run too;
+    # skip checks not relevant to the selected framework
+    checks = [
+        (check_fn, check_name) for check_fn, check_name in registered_checks()
+        if framework.name == "all" or check_name in framework.checks
+    ]
+    # One cache per scan: every file is read at most once, whichever checks use it
+    with FileCache(jobs=jobs, results=result_cache, max_file_size=max_file_size) as cache:
+        prescan(cache, project_path, files, [check_name for _, check_name in checks])
+        for check_fn, check_name in checks:
+            result = check_fn(project_path, files, cache)
+            logger.debug("Check %s: %d/%d", check_name, result["score"], result["max_score"])
+            check_results.append(result)
+    if result_cache is not None:
+        result_cache.save()
+
+    total_score = 0
+    total_max = 0
+    severities: Counter[str] = Counter()
+    for r in check_results:
+        total_score += r["score"]
+        total_max += r["max_score"]
+        severities.update(f["severity"] for f in r.get("findings", ()))
     pct = round((total_score / total_max) * 100) if total_max > 0 else 0
 
-    # Count severities across all findings
-    all_findings = [f for r in check_results for f in r.get("findings", [])]
-    critical = sum(1 for f in all_findings if f["severity"] == "critical")
-    warnings = sum(1 for f in all_findings if f["severity"] == "warning")
-    passed = sum(1 for f in all_findings if f["severity"] == "pass")
+    critical = severities["critical"]
+    warnings = severities["warning"]
+    passed = severities["pass"]
 
     logger.info("Scan complete: %d/%d (%d%%)", total_score, total_max, pct)
 